@@ -0,0 +1,103 @@
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+import metrics
+
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "16"))
+LLM_QUEUE_SIZE = int(os.getenv("LLM_QUEUE_SIZE", "64"))
+SERP_CONCURRENCY = int(os.getenv("SERP_CONCURRENCY", "8"))
+SERP_QUEUE_SIZE = int(os.getenv("SERP_QUEUE_SIZE", "32"))
+ADMISSION_TIMEOUT = float(os.getenv("ADMISSION_TIMEOUT", "10"))
+
+class AdmissionRejected(Exception):
+    def __init__(self, name):
+        super().__init__(f"{name} şu anda çok yoğun, lütfen biraz sonra tekrar deneyin")
+        self.name = name
+
+class Limiter:
+    def __init__(self, name, max_concurrent, max_waiting, max_wait=ADMISSION_TIMEOUT):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.max_wait = max_wait
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    def reject(self, reason):
+        self.rejected += 1
+        metrics.admission_rejected.inc(limiter=self.name, reason=reason)
+        raise AdmissionRejected(self.name)
+
+    @asynccontextmanager
+    async def slot(self):
+        if self.semaphore.locked() and self.waiting >= self.max_waiting:
+            self.reject("queue_full")
+
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            async with asyncio.timeout(self.max_wait):
+                await self.semaphore.acquire()
+        except TimeoutError:
+            self.reject("timeout")
+        finally:
+            self.waiting -= 1
+        metrics.record(metrics.admission_wait_seconds, time.perf_counter() - started, limiter=self.name)
+
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self.semaphore.release()
+
+    def stats(self):
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_concurrent": self.max_concurrent,
+            "max_waiting": self.max_waiting,
+            "rejected": self.rejected,
+        }
+
+class RateBudget:
+    def __init__(self, name, per_minute):
+        self.name = name
+        self.per_minute = per_minute
+        self.window = deque()
+        self.denied = 0
+        rate_budgets.append(self)
+
+    def used(self):
+        now = time.monotonic()
+        while self.window and now - self.window[0] >= 60:
+            self.window.popleft()
+        return len(self.window)
+
+    def take(self):
+        if self.used() >= self.per_minute:
+            self.denied += 1
+            return False
+        self.window.append(time.monotonic())
+        return True
+
+    def stats(self):
+        return {"used_last_minute": self.used(), "per_minute": self.per_minute, "denied": self.denied}
+
+rate_budgets = []
+
+llm_limiter = Limiter("llm", LLM_CONCURRENCY, LLM_QUEUE_SIZE)
+upstream_limiters = {
+    "serpapi": Limiter("serpapi", SERP_CONCURRENCY, SERP_QUEUE_SIZE),
+}
+
+def admission_stats():
+    limiters = [llm_limiter] + list(upstream_limiters.values())
+    return {
+        **{limiter.name: limiter.stats() for limiter in limiters},
+        "budgets": {budget.name: budget.stats() for budget in rate_budgets},
+    }
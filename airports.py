@@ -0,0 +1,136 @@
+import bisect
+import difflib
+import os
+from cache import normalize_key
+
+AIRPORTS_PATH = os.getenv(
+    "AIRPORTS_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "airports.tsv")
+)
+
+TURKISH_SUFFIXES = ("dan", "den", "tan", "ten", "nin", "ya", "ye", "na", "ne", "da", "de", "ta", "te", "in", "a", "e")
+
+def load_airports(path):
+    airports = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            code, city, name, country, aliases = line.rstrip("\n").split("\t")
+            airports[code] = (code, city, name, country, tuple(a for a in aliases.split("|") if a))
+    return airports
+
+def build_index(airports):
+    names = {}
+    for rank, (code, city, name, _, aliases) in enumerate(airports.values()):
+        entries = [(normalize_key(city), 0)] + [(normalize_key(a), 1) for a in aliases] + [(normalize_key(name), 2)]
+        for key, kind in entries:
+            matches = names.setdefault(key, [])
+            if all(existing[2] != code for existing in matches):
+                matches.append((kind, rank, code))
+    keys = sorted(names)
+    initials = {}
+    for key in keys:
+        initials.setdefault(key[0], []).append(key)
+    return names, keys, initials
+
+def build_city_index(airports):
+    cities = {}
+    for code, city, _, _, aliases in airports.values():
+        keys = [normalize_key(city)] + [normalize_key(a) for a in aliases if len(a) >= 4]
+        for key in keys:
+            cities.setdefault(key, set()).add(city)
+    return cities
+
+airports = load_airports(AIRPORTS_PATH)
+name_index, sorted_names, names_by_initial = build_index(airports)
+city_index = build_city_index(airports)
+
+def clean_query(text):
+    text = text.replace("’", "'").split("'")[0]
+    return normalize_key(text)
+
+def is_airport_code(code):
+    return isinstance(code, str) and code.upper() in airports
+
+def prefix_matches(query):
+    matches = []
+    start = bisect.bisect_left(sorted_names, query)
+    for key in sorted_names[start:]:
+        if not key.startswith(query):
+            break
+        matches.extend(name_index[key])
+    return matches
+
+def strip_suffix(query, index=None):
+    index = name_index if index is None else index
+    for suffix in TURKISH_SUFFIXES:
+        if query.endswith(suffix) and query[:-len(suffix)] in index:
+            return query[:-len(suffix)]
+    return None
+
+def match_cities(words):
+    matches = []
+    index = 0
+    while index < len(words):
+        for size in (2, 1):
+            candidate = " ".join(words[index:index + size])
+            key = candidate if candidate in city_index else strip_suffix(candidate, city_index)
+            if key:
+                matches.append((index, size, city_index[key]))
+                index += size
+                break
+        else:
+            index += 1
+    return matches
+
+def find_cities(text):
+    words = [clean_query(word) for word in text.split()]
+    cities = set()
+    for _, _, matched in match_cities(words):
+        cities.update(matched)
+    return cities
+
+def airport_info(code):
+    code, city, name, country, _ = airports[code]
+    return {"code": code, "city": city, "airport": name, "country": country}
+
+def search_airports(query, limit=8):
+    query = clean_query(query or "")
+    if not query:
+        return []
+
+    ranked = {}
+    def add(matches, tier):
+        for kind, rank, code in matches:
+            ranked[code] = min(ranked.get(code, (tier, kind, rank)), (tier, kind, rank))
+
+    if query.upper() in airports:
+        add([(0, 0, query.upper())], 0)
+    add(name_index.get(query, []), 1)
+    add(prefix_matches(query), 2)
+
+    if not ranked:
+        stem = strip_suffix(query)
+        if stem:
+            add(name_index[stem], 3)
+    if not ranked and len(query) >= 4:
+        candidates = names_by_initial.get(query[0], [])
+        for key in difflib.get_close_matches(query, candidates, n=limit, cutoff=0.75):
+            add(name_index[key], 4)
+
+    codes = sorted(ranked, key=ranked.get)[:limit]
+    return [airport_info(code) for code in codes]
+
+def resolve_airport(value):
+    value = (value or "").strip()
+    if is_airport_code(value):
+        return value.upper()
+    if len(value) == 3 and value.isascii() and value.isalpha() and value.isupper():
+        return value
+    query = clean_query(value)
+    key = query if query in name_index else strip_suffix(query)
+    if not key:
+        return None
+    _, _, code = min(name_index[key])
+    return code
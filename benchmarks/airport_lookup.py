@@ -0,0 +1,41 @@
+"""Latency of the bundled airport index used for flight code resolution.
+
+Times search_airports / resolve_airport over typical queries: codes, city
+names with Turkish case suffixes, English exonyms, prefixes, typos and
+misses (which fall through to the fuzzy matcher).
+
+    python benchmarks/airport_lookup.py
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import airports
+
+QUERIES = [
+    "IST", "saw", "İstanbul'dan", "Paris'e", "londraya", "izmirden", "Münih", "munich",
+    "new york", "Kapadokya", "bar", "Barselon", "tokio", "xyzqw", "Sabiha", "Zürih",
+]
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{len(airports.airports)} airports, {len(airports.sorted_names)} index keys")
+    print(f"{'query':<14} {'resolved':<9} {'candidates':<24} {'µs':>7}")
+    for query in QUERIES:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            airports.search_airports(query)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        candidates = ",".join(a["code"] for a in airports.search_airports(query, 4))
+        print(f"{query:<14} {str(airports.resolve_airport(query)):<9} {candidates:<24} {elapsed * 1e6:>7.1f}")
+
+
+if __name__ == "__main__":
+    main_cli()
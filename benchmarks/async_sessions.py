@@ -0,0 +1,92 @@
+"""Concurrent session load test for the async graph path.
+
+Runs N chat sessions on a single event loop against stubbed LLM/upstream
+latencies. ``blocking`` mode sleeps synchronously inside the nodes, which is
+what the old ``graph.invoke`` call did to the uvicorn loop; ``async`` mode
+awaits, so sessions overlap.
+
+    python benchmarks/async_sessions.py --sessions 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GROQ_API_KEY", "bench")
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+import llm_cache
+import main
+import prefetch
+import router
+
+
+class FakeLLM:
+    def __init__(self, latency, blocking):
+        self.latency = latency
+        self.blocking = blocking
+
+    async def ainvoke(self, messages):
+        await pause(self.latency, self.blocking)
+        if isinstance(messages[-1], ToolMessage):
+            return AIMessage(content="İşte sonuçlar.")
+        return AIMessage(content="", tool_calls=[{
+            "name": "get_weather",
+            "args": {"city": "Paris", "days": 1},
+            "id": f"call_{time.perf_counter_ns()}",
+        }])
+
+
+async def pause(seconds, blocking):
+    if blocking:
+        time.sleep(seconds)
+    else:
+        await asyncio.sleep(seconds)
+
+
+def install_stubs(llm_latency, tool_latency, blocking):
+    main.llm_with_tools = FakeLLM(llm_latency, blocking)
+
+    async def fake_weather(city, days=1):
+        await pause(tool_latency, blocking)
+        return {"city": city, "type": "current", "forecasts": []}
+
+    main.aget_weather = fake_weather
+    prefetch.PREFETCH_ENABLED = False
+    llm_cache.LLM_CACHE_ENABLED = False
+    router.FAST_PATH_ENABLED = False
+
+
+async def run_session(index):
+    config = {"configurable": {"thread_id": f"bench_{index}"}}
+    start = time.perf_counter()
+    await main.get_graph().ainvoke({"messages": [HumanMessage(content="Paris hava durumu")]}, config=config)
+    return time.perf_counter() - start
+
+
+async def run(sessions):
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(run_session(i) for i in range(sessions)))
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--tool-latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    for mode in ("blocking", "async"):
+        install_stubs(args.llm_latency, args.tool_latency, mode == "blocking")
+        wall, latencies = asyncio.run(run(args.sessions))
+        p50 = latencies[len(latencies) // 2]
+        print(f"{mode:>8}: {args.sessions} sessions in {wall:.2f}s "
+              f"(p50 {p50:.2f}s, max {latencies[-1]:.2f}s, {args.sessions / wall:.1f} turns/s)")
+
+
+if __name__ == "__main__":
+    main_cli()
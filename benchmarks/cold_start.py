@@ -0,0 +1,140 @@
+"""Worker cold start: import time, time to listen, time to ready, first turn.
+
+main.py used to import langgraph and langchain_groq and build ChatGroq,
+bind_tools and the compiled graph at module level, so a worker could not
+accept connections until all of that was done. Now the heavy imports and
+the graph build run in a lifespan warm-up task (off the event loop)
+together with upstream connection pre-warming, and GET /ready returns 503
+until it finishes.
+
+Import: median of fresh interpreters running `import main` versus
+`import main` plus the graph build (what the old module import did).
+Startup: launches `uvicorn main:app` with every upstream (Groq included)
+pointed at the recorded-response stub and polls /ready to report when the
+port answered and when it turned ready, then times the first WebSocket turn
+(a fast-path weather request, so no LLM call), with and without upstream
+pre-warming.
+
+    python benchmarks/cold_start.py --runs 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+import websockets
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from run_e2e import free_port
+from stub_upstream import start_stub_upstream
+
+IMPORT_SNIPPETS = {
+    "import main": "import main",
+    "import main + build graph": "import main; main.get_graph()",
+}
+IMPORT_PROBE = """
+import sys, time
+started = time.perf_counter()
+{snippet}
+print(time.perf_counter() - started)
+print(",".join(name for name in ("langgraph.graph", "langchain_groq", "requests") if name in sys.modules))
+"""
+
+
+def time_import(snippet, env):
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE.format(snippet=snippet)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout.split("\n")
+    return float(output[0]), output[1] or "-"
+
+
+def report_imports(runs, env):
+    print(f"import time (median of {runs} fresh interpreters)")
+    for label, snippet in IMPORT_SNIPPETS.items():
+        samples = [time_import(snippet, env) for _ in range(runs)]
+        median = statistics.median(seconds for seconds, _ in samples)
+        print(f"  {label:<28} {median * 1000:7.1f}ms   heavy modules loaded: {samples[-1][1]}")
+
+
+def get_ready(port):
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/ready", timeout=1) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+    except OSError:
+        return None, None
+
+
+async def first_turn(port):
+    started = time.perf_counter()
+    async with websockets.connect(f"ws://127.0.0.1:{port}/ws") as websocket:
+        await websocket.recv()
+        await websocket.send(json.dumps({"message": "Paris hava durumu", "stream": True}))
+        while json.loads(await websocket.recv())["type"] != "done":
+            pass
+    return time.perf_counter() - started
+
+
+def measure_startup(env, warm_upstreams):
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=dict(env, WARMUP_UPSTREAMS=str(warm_upstreams).lower()),
+    )
+    listening = None
+    try:
+        while time.perf_counter() - started < 60:
+            status, body = get_ready(port)
+            if status is not None and listening is None:
+                listening = time.perf_counter() - started
+            if status == 200:
+                ready = time.perf_counter() - started
+                return listening, ready, body, asyncio.run(first_turn(port))
+            time.sleep(0.01)
+        raise RuntimeError("server did not become ready")
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--upstream-latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    stub = start_stub_upstream(latency=args.upstream_latency)
+    env = dict(
+        os.environ,
+        GROQ_API_KEY=os.getenv("GROQ_API_KEY", "bench"),
+        GROQ_API_BASE=stub.base_url,
+        WEATHER_API_URL=f"{stub.base_url}/data/2.5",
+        SERP_API_URL=f"{stub.base_url}/search.json",
+    )
+    try:
+        report_imports(args.runs, env)
+        print("\nstartup (uvicorn main:app, seconds from spawn)")
+        for warm_upstreams in (False, True):
+            listening, ready, body, turn = measure_startup(env, warm_upstreams)
+            label = "pre-warmed pools" if warm_upstreams else "no pre-warm"
+            print(f"  {label:<17} listening {listening:5.2f}s, ready {ready:5.2f}s "
+                  f"(graph {body['graph_s']:.2f}s, upstreams {body.get('upstream_ms', '-')}), "
+                  f"first turn {turn * 1000:.0f}ms")
+    finally:
+        stub.shutdown()
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,88 @@
+"""Prompt size and turn time over scripted 20-turn conversations.
+
+Runs the same scripted conversation through the graph twice: once sending
+the full history (budget disabled) and once through build_context. The
+fake LLM charges a prefill cost per 1k prompt tokens so prompt growth
+shows up in wall time.
+
+    python benchmarks/context_budget.py
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GROQ_API_KEY", "bench")
+
+from langchain_core.messages import HumanMessage
+
+import context
+import llm_cache
+import main
+import prefetch
+import router
+from fakes import FakeToolCallingModel, sample_flights, sample_hotels, sample_weather
+
+SCRIPT = [
+    "Merhaba", "Paris hava durumu", "Paris otel", "İstanbul'dan Paris uçuş", "Teşekkürler",
+    "Roma hava durumu", "Roma otel", "Roma uçuş", "Paris otel", "Londra hava durumu",
+    "Londra otel", "Londra uçuş", "Antalya hava durumu", "Antalya otel", "Antalya uçuş",
+    "İzmir hava durumu", "İzmir otel", "Paris hava durumu", "Roma otel", "Görüşürüz",
+]
+
+
+def install_stubs():
+    async def fake_weather(city, days=1):
+        return sample_weather(city, days)
+
+    async def fake_hotels(location, budget=None, star_rating=None, check_in_date=None, check_out_date=None):
+        return sample_hotels(location, budget, star_rating)
+
+    async def fake_flights(departure, arrival, outbound_date, return_date=None, adults=1):
+        return sample_flights(departure, arrival, outbound_date, return_date, adults)
+
+    main.aget_weather = fake_weather
+    main.asearch_hotels = fake_hotels
+    main.asearch_flights = fake_flights
+    prefetch.PREFETCH_ENABLED = False
+    llm_cache.LLM_CACHE_ENABLED = False
+    router.FAST_PATH_ENABLED = False
+
+
+async def run_conversation(model, thread_id):
+    rows = []
+    for text in SCRIPT:
+        model.prompt_log.clear()
+        start = time.perf_counter()
+        await main.get_graph().ainvoke({"messages": [HumanMessage(content=text)]},
+                                 config={"configurable": {"thread_id": thread_id}})
+        rows.append((max(model.prompt_log), time.perf_counter() - start))
+    return rows
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--prefill-per-1k", type=float, default=0.05)
+    parser.add_argument("--budget", type=int, default=context.CONTEXT_TOKEN_BUDGET)
+    args = parser.parse_args()
+
+    install_stubs()
+    results = {}
+    for label, budget in (("full history", 10 ** 9), ("budgeted", args.budget)):
+        context.CONTEXT_TOKEN_BUDGET = budget
+        context.CONTEXT_KEEP_TURNS = 10 ** 6 if label == "full history" else 4
+        model = FakeToolCallingModel(latency=0.0, token_delay=0.0, prefill_per_1k=args.prefill_per_1k, prompt_log=[])
+        main.llm_with_tools = model
+        results[label] = asyncio.run(run_conversation(model, f"bench_{label}"))
+
+    print(f"{'turn':>4} {'full tokens':>12} {'budgeted':>9} {'full ms':>8} {'budgeted ms':>12}")
+    for turn, (full, budgeted) in enumerate(zip(results["full history"], results["budgeted"]), start=1):
+        print(f"{turn:>4} {full[0]:>12} {budgeted[0]:>9} {full[1] * 1000:>8.1f} {budgeted[1] * 1000:>12.1f}")
+    for label, rows in results.items():
+        print(f"{label}: total prompt tokens {sum(r[0] for r in rows)}, wall {sum(r[1] for r in rows):.2f}s")
+
+
+if __name__ == "__main__":
+    main_cli()
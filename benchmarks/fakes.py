@@ -0,0 +1,179 @@
+"""Local stand-ins used by the benchmark scripts instead of Groq and the upstream APIs."""
+import asyncio
+import json
+import time
+import uuid
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from cache import normalize_key
+
+CITIES = {"paris": "Paris", "roma": "Roma", "londra": "Londra", "antalya": "Antalya", "izmir": "İzmir"}
+AIRPORTS = {"Paris": "CDG", "Roma": "FCO", "Londra": "LHR", "Antalya": "AYT", "İzmir": "ADB"}
+
+
+def find_city(text):
+    for key, city in CITIES.items():
+        if key in normalize_key(text):
+            return city
+    return "Paris"
+
+
+def plan_reply(messages):
+    last = messages[-1]
+    if isinstance(last, ToolMessage):
+        return "İşte bulduğum sonuçlar 😊 Detaylar sağ panelde. " * 4, []
+
+    text = last.content.lower() if isinstance(last, HumanMessage) else ""
+    city = find_city(text)
+    if "hava" in text:
+        return "", [{"name": "get_weather", "args": {"city": city, "days": 3}}]
+    if "otel" in text:
+        return "", [{"name": "search_hotels", "args": {"location": city}}]
+    if "uçuş" in text:
+        return "", [{"name": "search_flights", "args": {"departure": "IST", "arrival": AIRPORTS[city], "outbound_date": "2026-11-01"}}]
+    return "Merhaba! Size seyahat planınızda nasıl yardımcı olabilirim? ✈️ " * 4, []
+
+
+def prompt_tokens(messages):
+    return sum(len(message.content if isinstance(message.content, str) else json.dumps(message.content)) // 4 + 4
+               for message in messages)
+
+
+class FakeToolCallingModel(BaseChatModel):
+    latency: float = 0.2
+    token_delay: float = 0.02
+    prefill_per_1k: float = 0.0
+    prompt_log: list | None = None
+
+    @property
+    def _llm_type(self):
+        return "fake-tool-calling"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def first_token_delay(self, messages):
+        tokens = prompt_tokens(messages)
+        if self.prompt_log is not None:
+            self.prompt_log.append(tokens)
+        return self.latency + tokens / 1000 * self.prefill_per_1k
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        content, tool_calls = plan_reply(messages)
+        time.sleep(self.first_token_delay(messages) + self.token_delay * len(content.split()))
+        return ChatResult(generations=[ChatGeneration(message=self.build_message(content, tool_calls))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        content, tool_calls = plan_reply(messages)
+        await asyncio.sleep(self.first_token_delay(messages) + self.token_delay * len(content.split()))
+        return ChatResult(generations=[ChatGeneration(message=self.build_message(content, tool_calls))])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        content, tool_calls = plan_reply(messages)
+        await asyncio.sleep(self.first_token_delay(messages))
+
+        if tool_calls:
+            chunk = AIMessageChunk(content="", tool_call_chunks=[
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": f"call_{uuid.uuid4().hex[:8]}", "index": index}
+                for index, call in enumerate(tool_calls)
+            ])
+            yield ChatGenerationChunk(message=chunk)
+            return
+
+        for token in content.split(" "):
+            await asyncio.sleep(self.token_delay)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token + " "))
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    def build_message(self, content, tool_calls):
+        return AIMessage(content=content, tool_calls=[
+            {"name": call["name"], "args": call["args"], "id": f"call_{uuid.uuid4().hex[:8]}"}
+            for call in tool_calls
+        ])
+
+
+def sample_weather(city, days=1):
+    names = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma"]
+    return {
+        "city": city,
+        "type": "current" if days == 1 else "forecast",
+        "days": days,
+        "forecasts": [{
+            "date": f"{10 + i} Kasım",
+            "day_name": names[i],
+            "temperature": 14 + i,
+            "description": "Parçalı bulutlu",
+            "weather_type": "cloudy",
+            "feels_like": 13 + i,
+            "humidity": 60 + i,
+            "icon": "03d",
+        } for i in range(days)],
+    }
+
+
+def sample_hotels(location, budget=None, star_rating=None):
+    return {
+        "location": location,
+        "budget": budget,
+        "star_rating": star_rating,
+        "currency": "TRY",
+        "currency_symbol": "₺",
+        "hotels": [{
+            "name": f"{location} Grand Hotel {i}",
+            "type": "hotel",
+            "overall_rating": 4.1 + i / 10,
+            "reviews": 1200 + i * 37,
+            "hotel_class": f"{3 + i % 3} yıldızlı otel",
+            "description": f"{location} merkezinde, tarihi yarımadaya yürüme mesafesinde, deniz manzaralı odaları, "
+                           "spa merkezi, açık büfe kahvaltısı ve çatı terası bulunan modern bir konaklama tesisi.",
+            "image": f"https://lh5.googleusercontent.com/p/AF1QipN{uuid.uuid4().hex}=w600-h400-k-no",
+            "latitude": 41.0 + i / 100,
+            "longitude": 28.9 + i / 100,
+            "rate_per_night": f"₺{3500 + i * 450}",
+            "amenities": ["Ücretsiz Wi-Fi", "Kahvaltı", "Otopark", "Havuz", "Spa"],
+        } for i in range(5)],
+    }
+
+
+def sample_flights(departure, arrival, outbound_date, return_date=None, adults=1):
+    def segment(frm, to, number):
+        return {
+            "departure_airport": f"{frm} International Airport",
+            "departure_code": frm,
+            "departure_time": f"{outbound_date} 0{number}:15",
+            "arrival_airport": f"{to} International Airport",
+            "arrival_code": to,
+            "arrival_time": f"{outbound_date} 1{number}:40",
+            "duration": 155,
+            "airplane": "Airbus A321neo",
+            "airline": "Turkish Airlines",
+            "airline_logo": "https://www.gstatic.com/flights/airline_logos/70px/TK.png",
+            "flight_number": f"TK {1820 + number}",
+            "travel_class": "Ekonomi",
+            "legroom": "79 cm",
+        }
+
+    return {
+        "departure": departure,
+        "arrival": arrival,
+        "outbound_date": outbound_date,
+        "return_date": return_date,
+        "adults": adults,
+        "currency": "TRY",
+        "currency_symbol": "₺",
+        "google_flights_url": f"https://www.google.com/travel/flights?q={departure}%20to%20{arrival}%20{outbound_date}",
+        "flights": [{
+            "price": 4200 + i * 380,
+            "type": "Tek yön",
+            "airline_logo": "https://www.gstatic.com/flights/airline_logos/70px/TK.png",
+            "total_duration": 155 + i * 90,
+            "carbon_emissions": 142000 + i * 5000,
+            "booking_url": None,
+            "flights": [segment(departure, arrival, i)] if i < 2 else [segment(departure, "MUC", i), segment("MUC", arrival, i)],
+        } for i in range(5)],
+    }
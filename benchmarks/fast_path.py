@@ -0,0 +1,93 @@
+"""LLM calls and turn latency with and without the rule-based fast path.
+
+Replays the scripted conversations used by the other benchmarks through
+the graph twice, once with the router disabled and once enabled, using
+the fake chat model and stubbed tools. Reports the share of turns answered
+without any LLM call and the latency difference.
+
+    python benchmarks/fast_path.py --llm-latency 0.4
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GROQ_API_KEY", "bench")
+
+from langchain_core.messages import HumanMessage
+
+import llm_cache
+import main
+import prefetch
+import router
+from context_budget import SCRIPT
+from fakes import FakeToolCallingModel, sample_flights, sample_hotels, sample_weather
+from ws_load import SCRIPTS
+
+
+def install_stubs(tool_latency):
+    async def fake_weather(city, days=1):
+        await asyncio.sleep(tool_latency)
+        return sample_weather(city, days)
+
+    async def fake_hotels(location, budget=None, star_rating=None, check_in_date=None, check_out_date=None):
+        await asyncio.sleep(tool_latency)
+        return sample_hotels(location, budget, star_rating)
+
+    async def fake_flights(departure, arrival, outbound_date, return_date=None, adults=1):
+        await asyncio.sleep(tool_latency)
+        return sample_flights(departure, arrival, outbound_date, return_date, adults)
+
+    main.aget_weather = fake_weather
+    main.asearch_hotels = fake_hotels
+    main.asearch_flights = fake_flights
+    prefetch.PREFETCH_ENABLED = False
+    llm_cache.LLM_CACHE_ENABLED = False
+
+
+async def run_conversations(model, label):
+    rows = []
+    for index, script in enumerate(SCRIPTS + [SCRIPT]):
+        config = {"configurable": {"thread_id": f"bench_{label}_{index}"}}
+        for text in script:
+            calls_before = len(model.prompt_log)
+            start = time.perf_counter()
+            await main.get_graph().ainvoke({"messages": [HumanMessage(content=text)], "turn_results": None}, config=config)
+            rows.append((text, len(model.prompt_log) - calls_before, time.perf_counter() - start))
+    return rows
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--llm-latency", type=float, default=0.4)
+    parser.add_argument("--token-delay", type=float, default=0.005)
+    parser.add_argument("--tool-latency", type=float, default=0.1)
+    args = parser.parse_args()
+
+    install_stubs(args.tool_latency)
+    results = {}
+    for label, enabled in (("llm only", False), ("fast path", True)):
+        router.FAST_PATH_ENABLED = enabled
+        model = FakeToolCallingModel(latency=args.llm_latency, token_delay=args.token_delay, prompt_log=[])
+        main.llm_with_tools = model
+        results[label] = asyncio.run(run_conversations(model, label.replace(" ", "_")))
+
+    for label, rows in results.items():
+        latencies = [row[2] for row in rows]
+        no_llm = sum(1 for row in rows if row[1] == 0)
+        print(f"{label:<10} turns {len(rows)}, LLM calls {sum(row[1] for row in rows)}, "
+              f"served without LLM {no_llm}/{len(rows)} ({no_llm / len(rows):.0%}), "
+              f"mean {statistics.mean(latencies) * 1000:.0f}ms, p50 {statistics.median(latencies) * 1000:.0f}ms, "
+              f"total {sum(latencies):.2f}s")
+
+    routed = [(a, b) for a, b in zip(results["llm only"], results["fast path"]) if b[1] == 0]
+    if routed:
+        saved = statistics.mean(a[2] - b[2] for a, b in routed)
+        print(f"routed turns: mean {saved * 1000:.0f}ms faster per turn")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,74 @@
+"""Flexible-date search: one calendar tool call versus per-date search_flights hops.
+
+Against the recorded-response upstream stub, compares the old pattern (the
+LLM calls search_flights once per date, each followed by another LLM round
+trip) with a single flight_price_calendar call that fans the dates out
+concurrently. The LLM hops are modelled as a fixed sleep. Each mode uses
+its own date window so both start with a cold cache; the calendar is then
+repeated to show the all-cached case.
+
+    python benchmarks/flexible_dates.py --upstream-latency 0.6 --llm-latency 0.8 --days 7
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from stub_upstream import start_stub_upstream
+
+
+async def per_date_hops(tool, start, days, llm_latency):
+    for offset in range(days):
+        await asyncio.sleep(llm_latency)
+        await tool.asearch_flights("IST", "AMS", (start + timedelta(days=offset)).isoformat())
+    await asyncio.sleep(llm_latency)
+
+
+async def calendar_hop(price_calendar, start, days, llm_latency):
+    await asyncio.sleep(llm_latency)
+    data = await price_calendar.flight_price_calendar("IST", "AMS", start.isoformat(), days)
+    await asyncio.sleep(llm_latency)
+    return data
+
+
+async def run(args, server):
+    import price_calendar
+    import tool
+
+    start = date.today() + timedelta(days=30)
+    modes = [
+        ("per-date search_flights", lambda: per_date_hops(tool, start, args.days, args.llm_latency)),
+        ("flight_price_calendar", lambda: calendar_hop(price_calendar, start + timedelta(days=args.days), args.days, args.llm_latency)),
+        ("calendar, cached", lambda: calendar_hop(price_calendar, start + timedelta(days=args.days), args.days, args.llm_latency)),
+    ]
+    for label, scenario in modes:
+        calls_before = server.counts["flights"]
+        started = time.perf_counter()
+        data = await scenario()
+        elapsed = time.perf_counter() - started
+        llm_hops = args.days + 1 if label.startswith("per-date") else 2
+        detail = f", queries {data['queries']}" if data else ""
+        print(f"{label:<24} {elapsed:6.2f}s  LLM hops {llm_hops:>2}, upstream calls {server.counts['flights'] - calls_before}{detail}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--upstream-latency", type=float, default=0.6)
+    parser.add_argument("--llm-latency", type=float, default=0.8)
+    parser.add_argument("--days", type=int, default=7)
+    args = parser.parse_args()
+
+    server = start_stub_upstream(latency=args.upstream_latency)
+    os.environ["SERP_API_URL"] = f"{server.base_url}/search.json"
+    os.environ.setdefault("SERP_API_KEY", "bench")
+    asyncio.run(run(args, server))
+
+
+if __name__ == "__main__":
+    main_cli()
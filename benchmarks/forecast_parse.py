@@ -0,0 +1,68 @@
+"""Forecast parsing: per-hit reparse of the raw response versus the cached aggregate.
+
+The previous get_weather cached the raw OpenWeatherMap forecast and
+re-parsed all 40 three-hour items on every hit, grouping them by the
+server's local date. Now the response is aggregated once into a compact
+per-day tuple list (in the city's UTC offset) and each hit only slices
+it. This times both paths for days=2..5 and shows how the day grouping
+moves when the same forecast belongs to a city far from the server's
+timezone.
+
+    python benchmarks/forecast_parse.py
+"""
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import tool
+
+
+def legacy_parse_forecast(data, days):
+    daily_forecasts = {}
+    for item in data["list"]:
+        dt = datetime.fromtimestamp(item["dt"])
+        date_str = dt.strftime("%Y-%m-%d")
+        if date_str not in daily_forecasts and 11 <= dt.hour <= 14:
+            description = item["weather"][0]["description"]
+            daily_forecasts[date_str] = {
+                "date": dt.strftime("%d %B"),
+                "temperature": round(item["main"]["temp"]),
+                "description": description.capitalize(),
+                "weather_type": tool.get_weather_type.__wrapped__(description),
+            }
+    return list(daily_forecasts.values())[:days]
+
+
+def per_call(function, repeat=2000):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main_cli():
+    with open(os.path.join(BENCH_DIR, "fixtures", "forecast.json"), encoding="utf-8") as f:
+        raw = json.load(f)
+
+    aggregate = tool.aggregate_forecast(raw)
+    print(f"aggregate once: {per_call(lambda: tool.aggregate_forecast(raw)) * 1e6:.1f}us, "
+          f"{len(aggregate['days'])} days from {len(raw['list'])} items")
+    for days in range(2, 6):
+        legacy = per_call(lambda: legacy_parse_forecast(raw, days))
+        cached = per_call(lambda: tool.forecast_view(aggregate, days))
+        print(f"  days={days}: legacy reparse per hit {legacy * 1e6:6.1f}us, cached view {cached * 1e6:5.1f}us")
+
+    shifted = dict(raw, city=dict(raw["city"], name="Los Angeles", timezone=-8 * 3600))
+    print("\nsame forecast for a UTC-8 city (date, midday temp, min-max):")
+    print("  legacy (server local):", [(d["date"], d["temperature"]) for d in legacy_parse_forecast(shifted, 5)])
+    print("  city local:           ", [(d["date"], d["temperature"], f"{d['temp_min']}-{d['temp_max']}")
+                                      for d in tool.parse_weather(shifted, 5)["forecasts"]])
+
+
+if __name__ == "__main__":
+    main_cli()
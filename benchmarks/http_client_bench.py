@@ -0,0 +1,137 @@
+"""Pooled client vs bare requests.get against a local stub upstream.
+
+Three scenarios:
+  * handshake: sequential GETs, counting TCP connections the stub accepts
+  * slow tail: every Nth request stalls; bare calls wait it out, the pooled
+    client times out the read and retries
+  * outage: the stub answers 503; once the breaker opens calls fail fast
+
+    python benchmarks/http_client_bench.py --requests 200
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+import http_client
+
+
+class StubState:
+    connections = 0
+    requests = 0
+    slow_every = 0
+    slow_seconds = 0.0
+    status = 200
+    lock = threading.Lock()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with StubState.lock:
+            StubState.connections += 1
+
+    def do_GET(self):
+        with StubState.lock:
+            StubState.requests += 1
+            count = StubState.requests
+        if StubState.slow_every and count % StubState.slow_every == 0:
+            time.sleep(StubState.slow_seconds)
+
+        body = json.dumps({"ok": True, "n": count}).encode()
+        self.send_response(StubState.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def reset_stub(slow_every=0, slow_seconds=0.0, status=200):
+    StubState.connections = 0
+    StubState.requests = 0
+    StubState.slow_every = slow_every
+    StubState.slow_seconds = slow_seconds
+    StubState.status = status
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def timed(call, count):
+    timings = []
+    errors = 0
+    for _ in range(count):
+        start = time.perf_counter()
+        try:
+            call()
+        except Exception:
+            errors += 1
+        timings.append(time.perf_counter() - start)
+    return timings, errors
+
+
+def report(label, timings, errors=0):
+    print(f"  {label:<22} mean {sum(timings) / len(timings) * 1000:7.2f}ms  "
+          f"p50 {percentile(timings, 0.5) * 1000:7.2f}ms  p99 {percentile(timings, 0.99) * 1000:8.2f}ms  "
+          f"max {max(timings) * 1000:8.2f}ms  errors {errors}  connections {StubState.connections}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--slow-every", type=int, default=20)
+    parser.add_argument("--slow-seconds", type=float, default=2.0)
+    parser.add_argument("--read-timeout", type=float, default=0.25)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/search.json"
+
+    http_client.HTTP_READ_TIMEOUT = args.read_timeout
+    http_client.HTTP_BACKOFF_BASE = 0.01
+
+    print("handshake")
+    reset_stub()
+    report("bare requests.get", *timed(lambda: requests.get(url, params={"q": "x"}), args.requests))
+    reset_stub()
+    report("http_client.get", *timed(lambda: http_client.get("stub", url, params={"q": "x"}), args.requests))
+
+    print(f"slow tail (every {args.slow_every}th request stalls {args.slow_seconds}s)")
+    tail_requests = min(args.requests, 100)
+    reset_stub(args.slow_every, args.slow_seconds)
+    report("bare requests.get", *timed(lambda: requests.get(url), tail_requests))
+    reset_stub(args.slow_every, args.slow_seconds)
+    report("http_client.get", *timed(lambda: http_client.get("stub_tail", url), tail_requests))
+
+    print("outage (503)")
+    reset_stub(status=503)
+    report("bare requests.get", *timed(lambda: requests.get(url), 50))
+    reset_stub(status=503)
+    report("http_client.get", *timed(lambda: http_client.get("stub_outage", url), 50))
+    print(f"  breaker: {http_client.breaker_stats()['stub_outage']}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,106 @@
+"""Resumable sessions across several uvicorn workers behind one port.
+
+Starts the stub upstream and benchmarks/serve.py with --workers N, then
+runs sessions that each connect with a client-held session_id, take a
+turn, disconnect and reconnect. Reconnects land on whichever worker the
+kernel hands the socket to, so with the shared SQLite checkpointer every
+reconnect should report resumed=true, while the in-process memory store
+loses the ones that land on another worker. Reconnect turns repeat the
+hotel search; with the SerpAPI cache on SQLite they are served from the
+shared cache instead of each worker going upstream again.
+
+    python benchmarks/multi_worker.py --workers 4 --store sqlite
+    python benchmarks/multi_worker.py --workers 4 --store memory
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+
+import websockets
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from run_e2e import free_port, wait_for_port
+from stub_upstream import start_stub_upstream
+
+
+async def take_turn(url, session_id, message):
+    async with websockets.connect(f"{url}?session_id={session_id}", max_size=None) as websocket:
+        session = json.loads(await websocket.recv())
+        await websocket.send(json.dumps({"message": message, "stream": True}))
+        frames = []
+        while True:
+            frame = json.loads(await websocket.recv())
+            frames.append(frame["type"])
+            if frame["type"] == "done":
+                return session["resumed"], frames
+
+
+async def run_sessions(url, sessions, reconnects):
+    results = {"first_resumed": 0, "reconnects": 0, "resumed": 0, "errors": 0}
+
+    async def one_session(index):
+        session_id = uuid.uuid4().hex
+        city = ("Paris", "Roma", "Londra")[index % 3]
+        resumed, frames = await take_turn(url, session_id, f"{city} otel")
+        results["first_resumed"] += resumed
+        for _ in range(reconnects):
+            resumed, frames = await take_turn(url, session_id, f"{city} otel")
+            results["reconnects"] += 1
+            results["resumed"] += resumed
+            results["errors"] += "error" in frames
+
+    await asyncio.gather(*(one_session(i) for i in range(sessions)))
+    return results
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--store", choices=("sqlite", "memory"), default="sqlite")
+    parser.add_argument("--sessions", type=int, default=12)
+    parser.add_argument("--reconnects", type=int, default=3)
+    args = parser.parse_args()
+
+    stub = start_stub_upstream(latency=0.1)
+    port = free_port()
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = dict(
+            os.environ,
+            WEATHER_API_URL=f"{stub.base_url}/data/2.5",
+            SERP_API_URL=f"{stub.base_url}/search.json",
+            CONVERSATION_STORE=args.store,
+            CONVERSATION_DB_PATH=os.path.join(data_dir, "conversations.sqlite3"),
+            SERP_CACHE_BACKEND=args.store,
+            SERP_CACHE_PATH=os.path.join(data_dir, "serpapi.sqlite3"),
+        )
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(BENCH_DIR, "serve.py"), "--port", str(port),
+             "--workers", str(args.workers), "--llm-latency", "0.05", "--token-delay", "0"],
+            cwd=ROOT, env=env,
+        )
+        try:
+            wait_for_port(port)
+            results = asyncio.run(run_sessions(f"ws://127.0.0.1:{port}/ws", args.sessions, args.reconnects))
+        finally:
+            server.terminate()
+            server.wait(timeout=15)
+            stub.shutdown()
+
+    print(f"store={args.store} workers={args.workers}")
+    print(f"  reconnects resumed: {results['resumed']}/{results['reconnects']}")
+    print(f"  new sessions reported as resumed: {results['first_resumed']}")
+    print(f"  turns with errors: {results['errors']}")
+    print(f"  upstream hotel searches for 3 cities: {stub.counts['hotels']} "
+          f"over {args.sessions * (args.reconnects + 1)} hotel turns")
+
+
+if __name__ == "__main__":
+    main_cli()
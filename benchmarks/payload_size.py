@@ -0,0 +1,97 @@
+"""Static asset and WebSocket frame sizes and serve/encode times.
+
+Static assets: bytes on the wire for identity, gzip and brotli, and the
+per-request cost of the old read-from-disk "/" handler versus the
+preloaded response. Frames: the recorded hotel/flight/weather results as
+sent to the browser, encoded as the previous default json.dumps, compact
+JSON and MessagePack (when installed), each also after raw deflate with the
+window uvicorn negotiates for permessage-deflate.
+
+    python benchmarks/payload_size.py
+"""
+import json
+import os
+import sys
+import time
+import zlib
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from fastapi.responses import HTMLResponse
+from starlette.requests import Request
+
+import frames
+import results
+import static_assets
+import tool
+
+FIXTURES = os.path.join(BENCH_DIR, "fixtures")
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, f"{name}.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def deflated(payload):
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    compressor = zlib.compressobj(wbits=-12)
+    return len(compressor.compress(payload) + compressor.flush(zlib.Z_SYNC_FLUSH)) - 4
+
+
+def per_call(function, repeat=2000):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def legacy_index():
+    with open("frontend/index.html", encoding="utf-8") as f:
+        return HTMLResponse(content=f.read())
+
+
+def report_static():
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", b"gzip, br")]})
+    static_assets.get_assets()
+    print("static assets (bytes): identity / gzip / br")
+    for name, stats in static_assets.asset_stats().items():
+        print(f"  {name:<12} {stats['bytes']:>7} / {stats.get('gzip', '-'):>6} / {stats.get('br', '-'):>6}")
+    print(f'  "/" serve time: read from disk {per_call(legacy_index) * 1e6:.1f}us, '
+          f'preloaded {per_call(lambda: static_assets.asset_response("index.html", request)) * 1e6:.1f}us')
+
+
+def sample_frames():
+    hotels = tool.parse_hotels(load_fixture("hotels"), "Paris")
+    flights = tool.parse_flights(load_fixture("flights"), "IST", "CDG", "2026-11-01")
+    weather = tool.parse_weather(load_fixture("forecast"), 5)
+    return {
+        "hotels": {"type": "hotels", "data": results.retain_results("bench", "hotels", hotels)},
+        "flights": {"type": "flights", "data": results.retain_results("bench", "flights", flights)},
+        "weather": {"type": "weather", "data": weather},
+        "delta": {"type": "delta", "content": "İşte bulduğum sonuçlar 😊"},
+    }
+
+
+def report_frames():
+    encoders = {"legacy json": json.dumps, "compact json": lambda frame: frames.encode_frame(frame, "json")}
+    if "msgpack" in frames.frame_encodings():
+        encoders["msgpack"] = lambda frame: frames.encode_frame(frame, "msgpack")
+
+    print("\nframes (bytes raw -> deflated, encode time)")
+    for name, frame in sample_frames().items():
+        cells = []
+        for label, encode in encoders.items():
+            payload = encode(frame)
+            size = len(payload.encode("utf-8")) if isinstance(payload, str) else len(payload)
+            cells.append(f"{label} {size:>5} -> {deflated(payload):>5} {per_call(lambda: encode(frame)) * 1e6:5.1f}us")
+        print(f"  {name:<8} " + " | ".join(cells))
+
+
+if __name__ == "__main__":
+    report_static()
+    report_frames()
@@ -0,0 +1,95 @@
+"""Follow-up latency and hit rate with and without speculative prefetch.
+
+Each session asks for a flight, then (after some think time) for the
+destination's weather and hotels. The tools run for real against the
+recorded-response upstream stub and the LLM is the fake chat model. Every
+mode runs in a fresh subprocess so the tool caches start cold.
+
+    python benchmarks/prefetch_hits.py --upstream-latency 0.4 --think-time 1.0
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+CITIES = ["Paris", "Roma", "Londra", "Antalya", "İzmir"]
+
+
+async def run_sessions(think_time):
+    from langchain_core.messages import HumanMessage
+
+    import main
+    import prefetch
+
+    rows = []
+    for city in CITIES:
+        config = {"configurable": {"thread_id": f"bench_{city}"}}
+        script = [f"İstanbul'dan {city} uçuş", f"{city} hava durumu", f"{city} otel"]
+        for index, text in enumerate(script):
+            start = time.perf_counter()
+            await main.get_graph().ainvoke({"messages": [HumanMessage(content=text)], "turn_results": None}, config=config)
+            if index:
+                rows.append(time.perf_counter() - start)
+            await asyncio.sleep(think_time)
+    return rows, prefetch.prefetch_stats()
+
+
+def run_child(args):
+    from stub_upstream import start_stub_upstream
+
+    server = start_stub_upstream(latency=args.upstream_latency)
+    os.environ["WEATHER_API_URL"] = f"{server.base_url}/data/2.5"
+    os.environ["SERP_API_URL"] = f"{server.base_url}/search.json"
+    os.environ["PREFETCH_ENABLED"] = "true" if args.child == "on" else "false"
+    for name in ("GROQ_API_KEY", "WEATHER_API_KEY", "SERP_API_KEY"):
+        os.environ.setdefault(name, "bench")
+
+    import main
+    from fakes import FakeToolCallingModel
+
+    main.llm_with_tools = FakeToolCallingModel(latency=args.llm_latency, token_delay=0.0)
+    rows, stats = asyncio.run(run_sessions(args.think_time))
+    print(json.dumps({"follow_ups": rows, "prefetch": stats, "upstream_calls": server.counts}))
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--upstream-latency", type=float, default=0.4)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--think-time", type=float, default=1.0)
+    parser.add_argument("--child", choices=["on", "off"])
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    for mode in ("off", "on"):
+        output = subprocess.check_output(
+            [sys.executable, __file__, "--child", mode,
+             "--upstream-latency", str(args.upstream_latency),
+             "--llm-latency", str(args.llm_latency),
+             "--think-time", str(args.think_time)],
+            text=True,
+        )
+        result = json.loads(output.strip().splitlines()[-1])
+        follow_ups = result["follow_ups"]
+        stats = result["prefetch"]
+        print(
+            f"prefetch {mode:<3}  follow-up mean {statistics.mean(follow_ups) * 1000:.0f}ms, "
+            f"p50 {statistics.median(follow_ups) * 1000:.0f}ms, "
+            f"prefetched {stats['started']}, used {stats['used']}, hit rate {stats['hit_rate']}, "
+            f"upstream calls {sum(result['upstream_calls'].values())}"
+        )
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,95 @@
+"""Per-turn result extraction cost over long conversation histories.
+
+Compares the previous extraction (scan the whole history for the last
+HumanMessage and final AIMessage, json.loads every ToolMessage of the turn
+and sniff its keys) with reading the typed turn_results channel that
+tool_node now writes into the graph state.
+
+    python benchmarks/result_extraction.py
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GROQ_API_KEY", "bench")
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+import main
+from fakes import sample_flights, sample_hotels, sample_weather
+
+
+def build_state(turns):
+    messages = []
+    results = {}
+    for index in range(turns):
+        results = {"weather": sample_weather("Paris", 3), "hotels": sample_hotels("Paris"), "flights": sample_flights("IST", "CDG", "2026-11-01")}
+        messages.append(HumanMessage(content=f"Paris hava, otel ve uçuş {index}"))
+        messages.append(AIMessage(content="", tool_calls=[
+            {"name": name, "args": {}, "id": f"call_{index}_{name}"} for name in ("get_weather", "search_hotels", "search_flights")
+        ]))
+        for result_type, name in (("weather", "get_weather"), ("hotels", "search_hotels"), ("flights", "search_flights")):
+            messages.append(ToolMessage(content=json.dumps(results[result_type], ensure_ascii=False),
+                                        tool_call_id=f"call_{index}_{name}"))
+        messages.append(AIMessage(content="İşte sonuçlar 😊"))
+    return {"messages": messages, "turn_results": main.merge_turn_results({}, results)}
+
+
+def scan_history(final_state):
+    messages = final_state["messages"]
+    last_ai_message = None
+    results = {}
+
+    last_human_index = -1
+    for i, msg in enumerate(messages):
+        if isinstance(msg, HumanMessage):
+            last_human_index = i
+
+    for msg in reversed(messages):
+        if isinstance(msg, AIMessage) and not msg.tool_calls:
+            last_ai_message = msg
+            break
+
+    for msg in messages[last_human_index + 1:]:
+        if isinstance(msg, ToolMessage):
+            try:
+                data = json.loads(msg.content)
+            except ValueError:
+                continue
+            for result_type, key in (("hotels", "hotels"), ("weather", "forecasts"), ("flights", "flights")):
+                if key in data and result_type not in results:
+                    results[result_type] = data
+                    break
+    return results, last_ai_message
+
+
+def read_turn_results(final_state):
+    return final_state.get("turn_results") or {}, final_state["messages"][-1]
+
+
+def measure(extract, state, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        extract(state)
+    return (time.perf_counter() - start) / repeat
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'turns':>6} {'messages':>9} {'scan µs':>9} {'typed µs':>9}")
+    for turns in (1, 10, 50, 200, 1000):
+        state = build_state(turns)
+        assert scan_history(state)[0].keys() == read_turn_results(state)[0].keys()
+        scan = measure(scan_history, state, args.repeat)
+        typed = measure(read_turn_results, state, args.repeat)
+        print(f"{turns:>6} {len(state['messages']):>9} {scan * 1e6:>9.1f} {typed * 1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,75 @@
+"""Cost of "show more" from retained results versus a fresh SerpAPI query.
+
+Parses the recorded hotel and flight responses, retains them the way a
+search turn does, then times next-page, sort and filter requests against
+the retained set. For comparison it times the same search re-issued
+against the upstream stub with the cache bypassed, and reports the frame
+size of the first page versus the full result list.
+
+    python benchmarks/result_paging.py --upstream-latency 0.8
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from stub_upstream import start_stub_upstream
+
+REQUESTS = {
+    "hotels": [(None, None), ("price", None), ("rating", {"max_price": 6000}), (None, {"min_stars": 4})],
+    "flights": [(None, None), ("price", None), ("duration", {"max_stops": 0}), ("stops", {"max_price": 6000})],
+}
+
+
+def time_browse(results, data, result_type, sort_by, filters, repeat):
+    elapsed = 0.0
+    for _ in range(repeat):
+        results.retain_results("bench", result_type, data)
+        start = time.perf_counter()
+        page = results.browse_results("bench", result_type, sort_by, filters)
+        elapsed += time.perf_counter() - start
+    return elapsed / repeat, page
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--upstream-latency", type=float, default=0.8)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    server = start_stub_upstream(latency=args.upstream_latency)
+    os.environ["SERP_API_URL"] = f"{server.base_url}/search.json"
+    os.environ.setdefault("SERP_API_KEY", "bench")
+
+    import results
+    import tool
+
+    fetches = {
+        "hotels": lambda: tool.fetch_hotels(tool.build_hotel_params("Paris"), "Paris"),
+        "flights": lambda: tool.fetch_flights(tool.build_flight_params("IST", "CDG", "2026-11-01"), "IST", "CDG", "2026-11-01"),
+    }
+
+    for result_type, fetch in fetches.items():
+        start = time.perf_counter()
+        data = fetch()
+        upstream = time.perf_counter() - start
+
+        first_page = results.retain_results("bench", result_type, data)
+        full_bytes = len(json.dumps({"type": result_type, "data": data}, ensure_ascii=False).encode("utf-8"))
+        page_bytes = len(json.dumps({"type": result_type, "data": first_page}, ensure_ascii=False).encode("utf-8"))
+        print(f"{result_type}: {first_page['page']['available']} retained, re-query {upstream * 1000:.0f}ms, "
+              f"first page {page_bytes} B vs full {full_bytes} B")
+
+        for sort_by, filters in REQUESTS[result_type]:
+            elapsed, page = time_browse(results, data, result_type, sort_by, filters, args.repeat)
+            label = f"sort={sort_by or '-'} filters={json.dumps(filters) if filters else '-'}"
+            print(f"  {label:<40} {elapsed * 1e6:7.1f}us  ({page['page']['count']}/{page['page']['total']})")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,149 @@
+"""Offline end-to-end benchmark: stub upstreams + fake LLM + WebSocket load.
+
+Starts the recorded-response upstream stub, launches benchmarks/serve.py in
+a subprocess pointed at it, drives /ws with concurrent scripted sessions
+and reports p50/p95/p99 turn latency, throughput and server RSS. Each run
+is written to benchmarks/results/ tagged with the current commit and
+compared against the previous run.
+
+    python benchmarks/run_e2e.py --sessions 50 --turns 5
+    python benchmarks/run_e2e.py --cold   # disable tool caches
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+sys.path.insert(0, BENCH_DIR)
+
+from stub_upstream import start_stub_upstream
+from ws_load import run_load, summarize
+
+COMPARED_METRICS = ("p50_ms", "p95_ms", "p99_ms", "throughput_turns_per_s", "rss_mb")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server did not start on port {port}")
+
+
+def rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        return None
+    return None
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def previous_result():
+    paths = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")))
+    if not paths:
+        return None
+    with open(paths[-1]) as f:
+        return json.load(f)
+
+
+def compare(current, previous):
+    if previous is None:
+        return
+    if previous.get("config") != current.get("config"):
+        print(f"previous run ({previous.get('commit')}) used a different config, skipping comparison")
+        return
+    print(f"vs previous run ({previous.get('commit')}, {previous.get('timestamp')}):")
+    for metric in COMPARED_METRICS:
+        before, after = previous["summary"].get(metric), current["summary"].get(metric)
+        if before and after is not None:
+            print(f"  {metric:<24} {before:>10} -> {after:>10} ({(after - before) / before:+.1%})")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--ramp", type=float, default=1.0)
+    parser.add_argument("--upstream-latency", type=float, default=0.3)
+    parser.add_argument("--upstream-jitter", type=float, default=0.1)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    parser.add_argument("--cold", action="store_true", help="disable weather and SerpAPI caches")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+
+    stub = start_stub_upstream(latency=args.upstream_latency, jitter=args.upstream_jitter)
+    port = free_port()
+    env = dict(
+        os.environ,
+        WEATHER_API_URL=f"{stub.base_url}/data/2.5",
+        SERP_API_URL=f"{stub.base_url}/search.json",
+    )
+    if args.cold:
+        env.update(WEATHER_CACHE_TTL="0", FORECAST_CACHE_TTL="0", SERP_CACHE_TTL="0", SERP_CACHE_STALE_TTL="0")
+
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(BENCH_DIR, "serve.py"), "--port", str(port),
+         "--llm-latency", str(args.llm_latency), "--token-delay", str(args.token_delay)],
+        cwd=ROOT, env=env,
+    )
+    try:
+        wait_for_port(port)
+        rss_before = rss_mb(server.pid)
+        results = asyncio.run(run_load(f"ws://127.0.0.1:{port}/ws", args.sessions, args.turns, args.ramp))
+        summary = summarize(results)
+        summary["rss_mb_idle"] = rss_before
+        summary["rss_mb"] = rss_mb(server.pid)
+        summary["upstream_calls"] = dict(stub.counts)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+        stub.shutdown()
+
+    config = {key: value for key, value in vars(args).items() if key != "no_save"}
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "config": config,
+        "summary": summary,
+    }
+    print(json.dumps(summary, indent=2))
+
+    compare(record, previous_result())
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        name = f"{record['timestamp'].replace(':', '').replace('+0000', 'Z')}-{record['commit'] or 'nogit'}.json"
+        with open(os.path.join(RESULTS_DIR, name), "w") as f:
+            json.dump(record, f, indent=2)
+
+
+if __name__ == "__main__":
+    main_cli()
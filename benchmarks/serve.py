@@ -0,0 +1,60 @@
+"""Run the real FastAPI app with the fake chat model in place of ChatGroq.
+
+Point WEATHER_API_URL / SERP_API_URL at benchmarks/stub_upstream.py to keep
+the whole stack offline. With --workers > 1 uvicorn imports serve:app in
+each worker process, so the fake model settings travel through BENCH_*
+environment variables.
+
+    python benchmarks/serve.py --port 8102 --llm-latency 0.3
+    python benchmarks/serve.py --port 8102 --workers 4
+"""
+import argparse
+import os
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+os.environ.setdefault("GROQ_API_KEY", "bench")
+os.environ.setdefault("WEATHER_API_KEY", "bench")
+os.environ.setdefault("SERP_API_KEY", "bench")
+
+import uvicorn
+
+import main
+from fakes import FakeToolCallingModel
+
+main.llm_with_tools = FakeToolCallingModel(
+    latency=float(os.getenv("BENCH_LLM_LATENCY", "0.3")),
+    token_delay=float(os.getenv("BENCH_TOKEN_DELAY", "0.01")),
+    prefill_per_1k=float(os.getenv("BENCH_PREFILL_PER_1K", "0.02")),
+)
+app = main.app
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8102)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    parser.add_argument("--prefill-per-1k", type=float, default=0.02)
+    args = parser.parse_args()
+
+    os.environ["BENCH_LLM_LATENCY"] = str(args.llm_latency)
+    os.environ["BENCH_TOKEN_DELAY"] = str(args.token_delay)
+    os.environ["BENCH_PREFILL_PER_1K"] = str(args.prefill_per_1k)
+    main.llm_with_tools = FakeToolCallingModel(
+        latency=args.llm_latency,
+        token_delay=args.token_delay,
+        prefill_per_1k=args.prefill_per_1k,
+    )
+
+    if args.workers > 1:
+        uvicorn.run("serve:app", app_dir=BENCH_DIR, host="127.0.0.1", port=args.port,
+                    workers=args.workers, log_level="warning")
+    else:
+        uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main_cli()
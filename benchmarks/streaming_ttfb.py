@@ -0,0 +1,81 @@
+"""Time to first frame for buffered vs streamed /ws turns.
+
+Drives the real FastAPI app through Starlette's TestClient with the fake
+chat model and a stubbed weather tool, and compares when the first frame
+and the terminal frame arrive for both modes.
+
+    python benchmarks/streaming_ttfb.py --turns 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GROQ_API_KEY", "bench")
+
+from fastapi.testclient import TestClient
+
+import llm_cache
+import main
+import prefetch
+import router
+from fakes import FakeToolCallingModel
+
+
+def install_stubs(llm_latency, token_delay, tool_latency):
+    main.llm_with_tools = FakeToolCallingModel(latency=llm_latency, token_delay=token_delay)
+
+    async def fake_weather(city, days=1):
+        await asyncio.sleep(tool_latency)
+        return {"city": city, "type": "current", "forecasts": [{"temperature": 18}]}
+
+    main.aget_weather = fake_weather
+    prefetch.PREFETCH_ENABLED = False
+    llm_cache.LLM_CACHE_ENABLED = False
+    router.FAST_PATH_ENABLED = False
+
+
+def run_turn(websocket, message, stream):
+    start = time.perf_counter()
+    websocket.send_text(json.dumps({"message": message, "stream": stream}))
+    first = None
+    while True:
+        frame = json.loads(websocket.receive_text())
+        now = time.perf_counter() - start
+        if first is None:
+            first = now
+        if stream and frame["type"] == "done":
+            return first, now
+        if not stream and frame["type"] in ("message", "weather", "error"):
+            return first, now
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.15)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    parser.add_argument("--tool-latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    install_stubs(args.llm_latency, args.token_delay, args.tool_latency)
+    client = TestClient(main.app)
+
+    for label, message in (("chat", "Merhaba"), ("weather tool", "Paris hava durumu")):
+        for stream in (False, True):
+            firsts, totals = [], []
+            with client.websocket_connect("/ws") as websocket:
+                for _ in range(args.turns):
+                    first, total = run_turn(websocket, message, stream)
+                    firsts.append(first)
+                    totals.append(total)
+            mode = "stream" if stream else "buffered"
+            print(f"{label:<13} {mode:<9} first frame {sum(firsts) / len(firsts) * 1000:7.1f}ms  "
+                  f"complete {sum(totals) / len(totals) * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main_cli()
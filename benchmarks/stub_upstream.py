@@ -0,0 +1,125 @@
+"""Local stand-in for OpenWeatherMap and SerpAPI replaying recorded responses.
+
+Serves /data/2.5/weather, /data/2.5/forecast and /search.json (google_hotels
+and google_flights engines) from benchmarks/fixtures with a configurable
+latency, so tool.py can be pointed at it through WEATHER_API_URL and
+SERP_API_URL.
+
+    python benchmarks/stub_upstream.py --port 9100 --latency 0.3
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, f"{name}.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class UpstreamStub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.0, jitter=0.0):
+        super().__init__(address, StubHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.fixtures = {name: load_fixture(name) for name in ("weather", "forecast", "hotels", "flights")}
+        self.counts = {name: 0 for name in self.fixtures}
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        name = self.route(url.path, query)
+        if name is None:
+            self.reply(404, {"error": "not found"})
+            return
+
+        with self.server.lock:
+            self.server.counts[name] += 1
+        delay = self.server.latency + random.uniform(0, self.server.jitter)
+        if delay:
+            time.sleep(delay)
+
+        data = self.server.fixtures[name]
+        if name == "weather":
+            data = dict(data, name=query.get("q", data["name"]))
+        elif name == "forecast":
+            data = dict(data, city=dict(data["city"], name=query.get("q", data["city"]["name"])))
+        self.reply(200, data)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def route(self, path, query):
+        if path.endswith("/data/2.5/weather"):
+            return "weather"
+        if path.endswith("/data/2.5/forecast"):
+            return "forecast"
+        if path.endswith("/search.json"):
+            return {"google_hotels": "hotels", "google_flights": "flights"}.get(query.get("engine"))
+        return None
+
+    def reply(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_upstream(port=0, latency=0.0, jitter=0.0):
+    server = UpstreamStub(("127.0.0.1", port), latency, jitter)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    args = parser.parse_args()
+
+    server = start_stub_upstream(args.port, args.latency, args.jitter)
+    print(f"WEATHER_API_URL={server.base_url}/data/2.5")
+    print(f"SERP_API_URL={server.base_url}/search.json")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main_cli()
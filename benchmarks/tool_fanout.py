@@ -0,0 +1,84 @@
+"""Multi-tool turn latency for tool_node with stubbed upstreams.
+
+One AI message asks for weather, hotels and flights at once; each stub
+sleeps for its configured latency. With TOOL_CONCURRENCY=1 the turn costs
+the sum of the three, with the default it should cost about the slowest.
+
+    python benchmarks/tool_fanout.py
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GROQ_API_KEY", "bench")
+
+from langchain_core.messages import AIMessage
+
+import main
+import prefetch
+
+
+def install_stubs(weather_latency, hotel_latency, flight_latency):
+    async def fake_weather(city, days=1):
+        await asyncio.sleep(weather_latency)
+        return {"city": city, "type": "current", "forecasts": []}
+
+    async def fake_hotels(location, budget=None, star_rating=None, check_in_date=None, check_out_date=None):
+        await asyncio.sleep(hotel_latency)
+        return {"location": location, "hotels": []}
+
+    async def fake_flights(departure, arrival, outbound_date, return_date=None, adults=1):
+        await asyncio.sleep(flight_latency)
+        return {"departure": departure, "arrival": arrival, "flights": []}
+
+    main.aget_weather = fake_weather
+    main.asearch_hotels = fake_hotels
+    main.asearch_flights = fake_flights
+    prefetch.PREFETCH_ENABLED = False
+
+
+def multi_tool_state():
+    message = AIMessage(content="", tool_calls=[
+        {"name": "get_weather", "args": {"city": "Paris"}, "id": "call_weather"},
+        {"name": "search_hotels", "args": {"location": "Paris"}, "id": "call_hotels"},
+        {"name": "search_flights", "args": {"departure": "IST", "arrival": "CDG", "outbound_date": "2026-11-01"}, "id": "call_flights"},
+    ])
+    return {"messages": [message]}
+
+
+async def measure(turns):
+    timings = []
+    for _ in range(turns):
+        start = time.perf_counter()
+        result = await main.tool_node(multi_tool_state(), {"configurable": {"thread_id": "bench"}})
+        timings.append(time.perf_counter() - start)
+        ids = [message.tool_call_id for message in result["messages"]]
+        assert ids == ["call_weather", "call_hotels", "call_flights"], ids
+    return sum(timings) / len(timings)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--weather-latency", type=float, default=0.15)
+    parser.add_argument("--hotel-latency", type=float, default=0.4)
+    parser.add_argument("--flight-latency", type=float, default=0.6)
+    args = parser.parse_args()
+
+    install_stubs(args.weather_latency, args.hotel_latency, args.flight_latency)
+    slowest = max(args.weather_latency, args.hotel_latency, args.flight_latency)
+    total = args.weather_latency + args.hotel_latency + args.flight_latency
+    print(f"stub latencies: slowest {slowest:.2f}s, sum {total:.2f}s")
+
+    default_concurrency = main.TOOL_CONCURRENCY
+    for concurrency in (1, default_concurrency):
+        main.TOOL_CONCURRENCY = concurrency
+        mean = asyncio.run(measure(args.turns))
+        print(f"concurrency={concurrency}: mean multi-tool turn {mean:.3f}s")
+
+
+if __name__ == "__main__":
+    main_cli()
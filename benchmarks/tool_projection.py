@@ -0,0 +1,102 @@
+"""Token cost of full vs slim tool payloads, and the effect on turn time.
+
+Token counts use the same chars/4 estimate as context.py. The end-to-end
+part runs a weather+hotels+flights turn through the graph with the fake
+LLM charging a prefill delay per 1k prompt tokens.
+
+    python benchmarks/tool_projection.py
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GROQ_API_KEY", "bench")
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+import llm_cache
+import main
+import prefetch
+import tool
+from fakes import FakeToolCallingModel, sample_flights, sample_hotels, sample_weather
+
+
+def tokens(text):
+    return len(text) // 4
+
+
+def payload_report():
+    samples = {
+        "get_weather": sample_weather("İstanbul", 5),
+        "search_hotels": sample_hotels("Antalya"),
+        "search_flights": sample_flights("IST", "CDG", "2026-11-01"),
+    }
+    print(f"{'tool':<15} {'full tokens':>11} {'slim tokens':>11} {'saved':>6}")
+    for name, data in samples.items():
+        full = tokens(json.dumps(data))
+        slim = tokens(json.dumps(tool.project_tool_result(name, data), ensure_ascii=False, separators=(",", ":")))
+        print(f"{name:<15} {full:>11} {slim:>11} {1 - slim / full:>6.0%}")
+
+
+class MultiToolModel(FakeToolCallingModel):
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        if isinstance(messages[-1], HumanMessage):
+            await asyncio.sleep(self.first_token_delay(messages))
+            message = AIMessage(content="", tool_calls=[
+                {"name": "get_weather", "args": {"city": "Paris", "days": 5}, "id": "call_w"},
+                {"name": "search_hotels", "args": {"location": "Paris"}, "id": "call_h"},
+                {"name": "search_flights", "args": {"departure": "IST", "arrival": "CDG", "outbound_date": "2026-11-01"}, "id": "call_f"},
+            ])
+            return ChatResult(generations=[ChatGeneration(message=message)])
+        return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+
+async def run_turns(label, turns):
+    timings = []
+    for index in range(turns):
+        start = time.perf_counter()
+        await main.get_graph().ainvoke({"messages": [HumanMessage(content="Paris seyahati")]},
+                                 config={"configurable": {"thread_id": f"{label}_{index}"}})
+        timings.append(time.perf_counter() - start)
+    return sum(timings) / len(timings)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--prefill-per-1k", type=float, default=0.1)
+    args = parser.parse_args()
+
+    payload_report()
+
+    async def fake_weather(city, days=1):
+        return sample_weather(city, days)
+
+    async def fake_hotels(location, budget=None, star_rating=None, check_in_date=None, check_out_date=None):
+        return sample_hotels(location, budget, star_rating)
+
+    async def fake_flights(departure, arrival, outbound_date, return_date=None, adults=1):
+        return sample_flights(departure, arrival, outbound_date, return_date, adults)
+
+    main.aget_weather = fake_weather
+    main.asearch_hotels = fake_hotels
+    main.asearch_flights = fake_flights
+    prefetch.PREFETCH_ENABLED = False
+    llm_cache.LLM_CACHE_ENABLED = False
+
+    projection = main.project_tool_result
+    for label, project in (("full payload", lambda name, data: data), ("slim projection", projection)):
+        main.project_tool_result = project
+        model = MultiToolModel(latency=0.05, token_delay=0.0, prefill_per_1k=args.prefill_per_1k, prompt_log=[])
+        main.llm_with_tools = model
+        mean = asyncio.run(run_turns(label, args.turns))
+        print(f"{label:<16} final prompt {max(model.prompt_log):>5} tokens, mean turn {mean * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,95 @@
+"""WebSocket load generator for /ws.
+
+Opens many concurrent sessions, each sending a scripted sequence of
+messages in streaming mode and timing every turn until its done frame.
+
+    python benchmarks/ws_load.py --url ws://127.0.0.1:8102/ws --sessions 50
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import websockets
+
+SCRIPTS = [
+    ["Merhaba", "Paris hava durumu", "Paris otel", "İstanbul'dan Paris uçuş", "Teşekkürler"],
+    ["Antalya hava durumu", "Antalya otel", "Antalya uçuş", "Roma hava durumu", "Görüşürüz"],
+    ["Londra otel", "Londra hava durumu", "Londra uçuş", "İzmir otel", "Teşekkürler"],
+]
+
+
+async def run_session(url, script, turns, results):
+    async with websockets.connect(url, max_size=None) as websocket:
+        await websocket.recv()
+        for index in range(turns):
+            message = script[index % len(script)]
+            start = time.perf_counter()
+            first = None
+            await websocket.send(json.dumps({"message": message, "stream": True}))
+            while True:
+                frame = json.loads(await websocket.recv())
+                if first is None:
+                    first = time.perf_counter() - start
+                if frame["type"] == "error":
+                    results["errors"] += 1
+                if frame["type"] == "done":
+                    break
+            results["latencies"].append(time.perf_counter() - start)
+            results["first_frame"].append(first)
+
+
+async def run_load(url, sessions, turns, ramp=0.0, seed=0):
+    rng = random.Random(seed)
+    results = {"latencies": [], "first_frame": [], "errors": 0, "failed_sessions": 0}
+
+    async def start_session(index):
+        await asyncio.sleep(ramp * index / max(1, sessions))
+        try:
+            await run_session(url, rng.choice(SCRIPTS), turns, results)
+        except (OSError, websockets.WebSocketException):
+            results["failed_sessions"] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(start_session(i) for i in range(sessions)))
+    results["wall"] = time.perf_counter() - start
+    return results
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def summarize(results):
+    latencies = results["latencies"]
+    return {
+        "turns": len(latencies),
+        "errors": results["errors"],
+        "failed_sessions": results["failed_sessions"],
+        "wall_s": round(results["wall"], 3),
+        "throughput_turns_per_s": round(len(latencies) / results["wall"], 2) if results["wall"] else None,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1) if latencies else None,
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1) if latencies else None,
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1) if latencies else None,
+        "first_frame_p50_ms": round(percentile(results["first_frame"], 0.50) * 1000, 1) if latencies else None,
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="ws://127.0.0.1:8102/ws")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--ramp", type=float, default=1.0)
+    args = parser.parse_args()
+
+    results = asyncio.run(run_load(args.url, args.sessions, args.turns, args.ramp))
+    print(json.dumps(summarize(results), indent=2))
+
+
+if __name__ == "__main__":
+    main_cli()
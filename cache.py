@@ -0,0 +1,394 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+def normalize_key(text):
+    text = str(text).strip().replace("ı", "i").replace("I", "i")
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(text.casefold().split())
+
+class TTLCache:
+    def __init__(self, ttl, max_size=256, max_bytes=None, sizeof=None):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def remove(self, key):
+        _, value, size = self.entries.pop(key)
+        self.bytes -= size
+        return value
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value, _ = entry
+            if expires_at <= time.monotonic():
+                self.remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        size = self.sizeof(value) if self.sizeof else 0
+        with self.lock:
+            if key in self.entries:
+                self.remove(key)
+            self.entries[key] = (time.monotonic() + self.ttl, value, size)
+            self.bytes += size
+            while len(self.entries) > self.max_size or (
+                self.max_bytes is not None and self.bytes > self.max_bytes and len(self.entries) > 1
+            ):
+                self.remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def contains(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            return entry is not None and entry[0] > time.monotonic()
+
+    def pop(self, key):
+        with self.lock:
+            if key not in self.entries:
+                return None
+            expires_at = self.entries[key][0]
+            value = self.remove(key)
+            if expires_at <= time.monotonic():
+                return None
+            return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self.lock:
+            stats = {
+                "size": len(self.entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+            if self.max_bytes is not None:
+                stats["bytes"] = self.bytes
+                stats["max_bytes"] = self.max_bytes
+            return stats
+
+class MemoryBackend:
+    blocking = False
+
+    def __init__(self, max_size=512):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key, value, stored_at):
+        with self.lock:
+            self.entries[key] = (stored_at, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def size(self):
+        with self.lock:
+            return len(self.entries)
+
+class SQLiteBackend:
+    blocking = True
+
+    def __init__(self, path, max_size=5000, access_flush_size=64, access_flush_interval=30):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.max_size = max_size
+        self.access_flush_size = access_flush_size
+        self.access_flush_interval = access_flush_interval
+        self.lock = threading.Lock()
+        self.evictions = 0
+        self.pending_access = {}
+        self.flushed_at = time.monotonic()
+        self.connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, stored_at REAL, accessed_at REAL, value TEXT)"
+        )
+        self.connection.commit()
+        self.count = self.count_rows()
+
+    def count_rows(self):
+        return self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def write_access_times(self):
+        if self.pending_access:
+            self.connection.executemany(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self.pending_access.items()]
+            )
+            self.pending_access.clear()
+        self.flushed_at = time.monotonic()
+
+    def get(self, key):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT stored_at, value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.pending_access[key] = time.time()
+            if (len(self.pending_access) >= self.access_flush_size
+                    or time.monotonic() - self.flushed_at >= self.access_flush_interval):
+                self.write_access_times()
+                self.connection.commit()
+            return row[0], json.loads(row[1])
+
+    def set(self, key, value, stored_at):
+        with self.lock:
+            self.pending_access.pop(key, None)
+            self.write_access_times()
+            payload = json.dumps(value, ensure_ascii=False)
+            updated = self.connection.execute(
+                "UPDATE entries SET stored_at = ?, accessed_at = ?, value = ? WHERE key = ?",
+                (stored_at, time.time(), payload, key)
+            ).rowcount
+            if not updated:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO entries (key, stored_at, accessed_at, value) VALUES (?, ?, ?, ?)",
+                    (key, stored_at, time.time(), payload)
+                )
+                self.count += 1
+            if self.count > self.max_size:
+                self.count = self.count_rows()
+                overflow = self.count - self.max_size
+                if overflow > 0:
+                    self.connection.execute(
+                        "DELETE FROM entries WHERE key IN "
+                        "(SELECT key FROM entries ORDER BY accessed_at LIMIT ?)", (overflow,)
+                    )
+                    self.evictions += overflow
+                    self.count -= overflow
+            self.connection.commit()
+
+    def delete(self, key):
+        with self.lock:
+            self.pending_access.pop(key, None)
+            self.count -= self.connection.execute("DELETE FROM entries WHERE key = ?", (key,)).rowcount
+            self.connection.commit()
+
+    def size(self):
+        return self.count
+
+class InflightCall:
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+    def wait(self):
+        self.event.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+class SWRCache:
+    def __init__(self, backend, ttl, stale_ttl):
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.inflight = {}
+        self.threads_inflight = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    async def call_backend(self, method, *args):
+        if self.backend.blocking:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    def classify(self, entry):
+        if entry is None:
+            return None, False, False
+
+        stored_at, value = entry
+        age = time.time() - stored_at
+        if age < self.ttl:
+            self.hits += 1
+            return value, False, False
+        if age < self.ttl + self.stale_ttl:
+            self.stale_hits += 1
+            return value, True, False
+        return None, False, True
+
+    def lookup(self, key):
+        value, stale, expired = self.classify(self.backend.get(key))
+        if expired:
+            self.backend.delete(key)
+        return value, stale
+
+    async def alookup(self, key):
+        value, stale, expired = self.classify(await self.call_backend(self.backend.get, key))
+        if expired:
+            await self.call_backend(self.backend.delete, key)
+        return value, stale
+
+    async def ais_fresh(self, key):
+        entry = await self.call_backend(self.backend.get, key)
+        return entry is not None and time.time() - entry[0] < self.ttl
+
+    def cacheable(self, value):
+        return not (isinstance(value, dict) and "error" in value)
+
+    def store(self, key, value):
+        if not self.cacheable(value):
+            return False
+        self.backend.set(key, value, time.time())
+        return True
+
+    async def astore(self, key, value):
+        if not self.cacheable(value):
+            return False
+        await self.call_backend(self.backend.set, key, value, time.time())
+        return True
+
+    async def aget_or_fetch(self, key, fetch):
+        value, stale = await self.alookup(key)
+        if value is not None:
+            if stale and key not in self.inflight:
+                self.refreshes += 1
+                self.start_async_fetch(key, fetch, refresh=True)
+            return value
+
+        task = self.inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = self.start_async_fetch(key, fetch)
+        return await asyncio.shield(task)
+
+    def start_async_fetch(self, key, fetch, refresh=False):
+        async def run():
+            try:
+                value = await fetch()
+                if not await self.astore(key, value) and refresh:
+                    self.refresh_failures += 1
+                return value
+            except Exception:
+                if not refresh:
+                    raise
+                self.refresh_failures += 1
+            finally:
+                self.inflight.pop(key, None)
+
+        task = asyncio.get_running_loop().create_task(run())
+        self.inflight[key] = task
+        return task
+
+    def get_or_fetch(self, key, fetch):
+        value, stale = self.lookup(key)
+        if value is not None:
+            if stale:
+                with self.lock:
+                    if key not in self.threads_inflight:
+                        self.refreshes += 1
+                        self.threads_inflight[key] = InflightCall()
+                        threading.Thread(target=self.refresh_in_thread, args=(key, fetch), daemon=True).start()
+            return value
+
+        with self.lock:
+            call = self.threads_inflight.get(key)
+            leader = call is None
+            if leader:
+                self.misses += 1
+                call = InflightCall()
+                self.threads_inflight[key] = call
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return call.wait()
+
+        try:
+            call.value = fetch()
+            self.store(key, call.value)
+            return call.value
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                self.threads_inflight.pop(key, None)
+            call.event.set()
+
+    def refresh_in_thread(self, key, fetch):
+        call = self.threads_inflight.get(key)
+        try:
+            call.value = fetch()
+            if not self.store(key, call.value):
+                self.refresh_failures += 1
+        except Exception as e:
+            call.error = e
+            self.refresh_failures += 1
+        finally:
+            with self.lock:
+                self.threads_inflight.pop(key, None)
+            call.event.set()
+
+    def stats(self):
+        return {
+            "backend": type(self.backend).__name__,
+            "size": self.backend.size(),
+            "max_size": self.backend.max_size,
+            "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "evictions": self.backend.evictions,
+        }
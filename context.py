@@ -0,0 +1,184 @@
+import json
+import os
+from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
+from airports import airports, find_cities, resolve_airport
+
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "6000"))
+CONTEXT_KEEP_TURNS = int(os.getenv("CONTEXT_KEEP_TURNS", "4"))
+
+SEARCH_KEYS = {
+    "get_weather": ("city",),
+    "search_hotels": ("location", "budget", "star_rating"),
+    "search_flights": ("departure", "arrival", "outbound_date", "return_date"),
+    "flight_price_calendar": ("departure", "arrival", "start_date", "days", "min_nights", "max_nights"),
+    "find_airport": ("query",),
+}
+
+def estimate_tokens(message):
+    content = message.content if isinstance(message.content, str) else json.dumps(message.content)
+    tokens = len(content) // 4 + 4
+    for tool_call in getattr(message, "tool_calls", None) or []:
+        tokens += len(json.dumps(tool_call["args"])) // 4 + 8
+    return tokens
+
+def close_dangling_tool_calls(messages):
+    answered = {message.tool_call_id for message in messages if isinstance(message, ToolMessage)}
+    closed = []
+    for message in messages:
+        closed.append(message)
+        for tool_call in getattr(message, "tool_calls", None) or []:
+            if tool_call["id"] not in answered:
+                closed.append(ToolMessage(content=f"{tool_call['name']} iptal edildi", tool_call_id=tool_call["id"]))
+    return closed
+
+def split_turns(messages):
+    turns = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+def search_signature(tool_call):
+    keys = SEARCH_KEYS.get(tool_call["name"], ())
+    values = tuple(str(tool_call["args"].get(key, "")).strip().lower() for key in keys)
+    return tool_call["name"], values
+
+def summarize_weather(data):
+    days = ", ".join(
+        f"{f.get('day_name')} {f.get('temperature')}°C {f.get('description')}"
+        for f in data.get("forecasts", [])
+    )
+    return f"Hava durumu {data.get('city')}: {days}"
+
+def summarize_hotels(data):
+    symbol = data.get("currency_symbol", "")
+    hotels = "; ".join(
+        f"{h.get('name')} ({h.get('overall_rating')}⭐, {symbol}{h.get('rate_per_night') or h.get('total_rate')})"
+        for h in data.get("hotels", [])[:3]
+    )
+    return f"Oteller {data.get('location')}: {hotels}"
+
+def summarize_flights(data):
+    symbol = data.get("currency_symbol", "")
+    flights = "; ".join(
+        f"{symbol}{f.get('price')} {f.get('total_duration')}dk {(f.get('flights') or [{}])[0].get('airline')}"
+        for f in data.get("flights", [])[:3]
+    )
+    return f"Uçuşlar {data.get('departure')}→{data.get('arrival')} {data.get('outbound_date')}: {flights}"
+
+def summarize_calendar(data):
+    cheapest = data.get("cheapest") or {}
+    dates = cheapest.get("outbound_date", "")
+    if cheapest.get("return_date"):
+        dates += f"→{cheapest['return_date']}"
+    return f"Fiyat takvimi {data.get('departure')}→{data.get('arrival')} {len(data.get('outbound_dates', []))} gün: en ucuz {dates} {cheapest.get('price')}"
+
+def summarize_page(data):
+    if "hotels" in data:
+        return summarize_hotels(data)
+    return summarize_flights(data)
+
+summarizers = {
+    "get_weather": summarize_weather,
+    "search_hotels": summarize_hotels,
+    "search_flights": summarize_flights,
+    "browse_results": summarize_page,
+    "flight_price_calendar": summarize_calendar,
+}
+
+def summarize_tool_result(tool_name, content):
+    try:
+        data = json.loads(content)
+    except (TypeError, ValueError):
+        return f"{tool_name}: {str(content)[:120]}"
+
+    summarizer = summarizers.get(tool_name)
+    if summarizer is None or not isinstance(data, dict):
+        return f"{tool_name}: {str(content)[:120]}"
+    return summarizer(data)
+
+def compact_turn(turn, later_searches):
+    tool_names = {}
+    for message in turn:
+        for tool_call in getattr(message, "tool_calls", None) or []:
+            tool_names[tool_call["id"]] = tool_call
+
+    summaries = []
+    final_reply = None
+    for message in turn:
+        if isinstance(message, ToolMessage):
+            tool_call = tool_names.get(message.tool_call_id)
+            if tool_call is None or search_signature(tool_call) in later_searches:
+                continue
+            summaries.append(summarize_tool_result(tool_call["name"], message.content))
+        elif isinstance(message, AIMessage) and not message.tool_calls and message.content:
+            final_reply = message.content
+
+    compacted = [turn[0]] if isinstance(turn[0], HumanMessage) else []
+    parts = []
+    if summaries:
+        parts.append("[Önceki araç sonuçları] " + " | ".join(summaries))
+    if final_reply:
+        parts.append(final_reply)
+    if parts:
+        compacted.append(AIMessage(content="\n".join(parts)))
+    return compacted
+
+def build_context(messages, budget=None, keep_turns=None):
+    budget = CONTEXT_TOKEN_BUDGET if budget is None else budget
+    keep_turns = CONTEXT_KEEP_TURNS if keep_turns is None else keep_turns
+
+    turns = split_turns(close_dangling_tool_calls(messages))
+    recent = turns[-keep_turns:] if keep_turns > 0 else []
+    older = turns[:len(turns) - len(recent)]
+
+    later_searches = set()
+    for turn in recent:
+        for message in turn:
+            for tool_call in getattr(message, "tool_calls", None) or []:
+                later_searches.add(search_signature(tool_call))
+
+    compacted_older = []
+    for turn in reversed(older):
+        compacted_older.append(compact_turn(turn, later_searches))
+        for message in turn:
+            for tool_call in getattr(message, "tool_calls", None) or []:
+                later_searches.add(search_signature(tool_call))
+    compacted_older.reverse()
+
+    recent_messages = [message for turn in recent for message in turn]
+    used = sum(estimate_tokens(message) for message in recent_messages)
+
+    kept_older = []
+    for turn in reversed(compacted_older):
+        cost = sum(estimate_tokens(message) for message in turn)
+        if used + cost > budget:
+            break
+        kept_older.append(turn)
+        used += cost
+
+    while len(recent) > 1 and used > budget:
+        dropped = recent.pop(0)
+        used -= sum(estimate_tokens(message) for message in dropped)
+        recent_messages = [message for turn in recent for message in turn]
+
+    return [message for turn in reversed(kept_older) for message in turn] + recent_messages
+
+def trip_dates(messages, location):
+    cities = find_cities(location)
+    for message in reversed(messages):
+        for tool_call in getattr(message, "tool_calls", None) or []:
+            if tool_call["name"] != "search_flights":
+                continue
+            code = resolve_airport(tool_call["args"].get("arrival"))
+            if code in airports and airports[code][1] in cities:
+                return tool_call["args"].get("outbound_date"), tool_call["args"].get("return_date")
+    return None, None
+
+def has_hotel_filters(messages):
+    return any(
+        tool_call["name"] == "search_hotels" and (tool_call["args"].get("budget") or tool_call["args"].get("star_rating"))
+        for message in messages
+        for tool_call in getattr(message, "tool_calls", None) or []
+    )
@@ -0,0 +1,17 @@
+import json
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+def frame_encodings():
+    return ("json", "msgpack") if msgpack is not None else ("json",)
+
+def negotiate_encoding(requested):
+    return requested if requested in frame_encodings() else "json"
+
+def encode_frame(frame, encoding):
+    if encoding == "msgpack":
+        return msgpack.packb(frame, use_bin_type=True)
+    return json.dumps(frame, ensure_ascii=False, separators=(",", ":"))
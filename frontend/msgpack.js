@@ -0,0 +1,83 @@
+// MessagePack decoder for WebSocket frames encoded by frames.py (msgpack.packb).
+// Served from /static so ?msgpack works without a third-party CDN.
+
+const textDecoder = new TextDecoder();
+
+export function decode(bytes) {
+    const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+    let offset = 0;
+
+    function readString(length) {
+        const value = textDecoder.decode(bytes.subarray(offset, offset + length));
+        offset += length;
+        return value;
+    }
+
+    function readBinary(length) {
+        const value = bytes.slice(offset, offset + length);
+        offset += length;
+        return value;
+    }
+
+    function readArray(length) {
+        const value = new Array(length);
+        for (let i = 0; i < length; i++) {
+            value[i] = read();
+        }
+        return value;
+    }
+
+    function readMap(length) {
+        const value = {};
+        for (let i = 0; i < length; i++) {
+            const key = read();
+            value[key] = read();
+        }
+        return value;
+    }
+
+    function next(size, getter) {
+        const value = getter(offset);
+        offset += size;
+        return value;
+    }
+
+    function read() {
+        const type = view.getUint8(offset++);
+
+        if (type <= 0x7f) return type;
+        if (type <= 0x8f) return readMap(type & 0x0f);
+        if (type <= 0x9f) return readArray(type & 0x0f);
+        if (type <= 0xbf) return readString(type & 0x1f);
+        if (type >= 0xe0) return type - 0x100;
+
+        switch (type) {
+            case 0xc0: return null;
+            case 0xc2: return false;
+            case 0xc3: return true;
+            case 0xc4: return readBinary(next(1, (o) => view.getUint8(o)));
+            case 0xc5: return readBinary(next(2, (o) => view.getUint16(o)));
+            case 0xc6: return readBinary(next(4, (o) => view.getUint32(o)));
+            case 0xca: return next(4, (o) => view.getFloat32(o));
+            case 0xcb: return next(8, (o) => view.getFloat64(o));
+            case 0xcc: return next(1, (o) => view.getUint8(o));
+            case 0xcd: return next(2, (o) => view.getUint16(o));
+            case 0xce: return next(4, (o) => view.getUint32(o));
+            case 0xcf: return Number(next(8, (o) => view.getBigUint64(o)));
+            case 0xd0: return next(1, (o) => view.getInt8(o));
+            case 0xd1: return next(2, (o) => view.getInt16(o));
+            case 0xd2: return next(4, (o) => view.getInt32(o));
+            case 0xd3: return Number(next(8, (o) => view.getBigInt64(o)));
+            case 0xd9: return readString(next(1, (o) => view.getUint8(o)));
+            case 0xda: return readString(next(2, (o) => view.getUint16(o)));
+            case 0xdb: return readString(next(4, (o) => view.getUint32(o)));
+            case 0xdc: return readArray(next(2, (o) => view.getUint16(o)));
+            case 0xdd: return readArray(next(4, (o) => view.getUint32(o)));
+            case 0xde: return readMap(next(2, (o) => view.getUint16(o)));
+            case 0xdf: return readMap(next(4, (o) => view.getUint32(o)));
+            default: throw new Error(`Desteklenmeyen MessagePack tipi: 0x${type.toString(16)}`);
+        }
+    }
+
+    return read();
+}
@@ -0,0 +1,209 @@
+import asyncio
+import os
+import random
+import threading
+import time
+import httpx
+import metrics
+from admission import upstream_limiters
+
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.25"))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "2"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class CircuitOpenError(Exception):
+    def __init__(self, upstream, retry_in):
+        super().__init__(f"{upstream} geçici olarak devre dışı, {retry_in:.0f} sn sonra tekrar denenecek")
+        self.upstream = upstream
+        self.retry_in = retry_in
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=CIRCUIT_FAILURE_THRESHOLD, reset_timeout=CIRCUIT_RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_started_at = None
+        self.lock = threading.Lock()
+        self.rejected = 0
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_request(self):
+        with self.lock:
+            state = self.state
+            if state == "closed":
+                return
+            now = time.monotonic()
+            trial_expired = self.trial_started_at is None or now - self.trial_started_at >= self.reset_timeout
+            if state == "half_open" and trial_expired:
+                self.trial_started_at = now
+                return
+            self.rejected += 1
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+            raise CircuitOpenError(self.name, retry_in)
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_started_at = None
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial_started_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.trial_started_at = None
+
+    def stats(self):
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "rejected": self.rejected,
+        }
+
+breakers = {}
+breakers_lock = threading.Lock()
+
+def get_breaker(upstream):
+    with breakers_lock:
+        if upstream not in breakers:
+            breakers[upstream] = CircuitBreaker(upstream)
+        return breakers[upstream]
+
+def backoff_delay(attempt):
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * (2 ** attempt)))
+
+_session = None
+_session_lock = threading.Lock()
+_async_client = None
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=HTTP_POOL_SIZE)
+            _session = requests.Session()
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+def create_async_client():
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=HTTP_POOL_SIZE * 4,
+            max_keepalive_connections=HTTP_POOL_SIZE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+def get_async_client():
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = create_async_client()
+    return _async_client
+
+async def close_async_client():
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+async def prewarm(url, client=None):
+    started = time.perf_counter()
+    try:
+        await (client or get_async_client()).head(url, timeout=HTTP_CONNECT_TIMEOUT)
+    except httpx.HTTPError:
+        return None
+    return round((time.perf_counter() - started) * 1000, 1)
+
+def get(upstream, url, params=None):
+    import requests
+    breaker = get_breaker(upstream)
+    breaker.before_request()
+    started = time.perf_counter()
+    status = "error"
+
+    try:
+        for attempt in range(HTTP_MAX_RETRIES + 1):
+            last_attempt = attempt == HTTP_MAX_RETRIES
+            try:
+                response = get_session().get(url, params=params, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT))
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if last_attempt:
+                    breaker.record_failure()
+                    raise
+            except requests.exceptions.RequestException:
+                breaker.record_failure()
+                raise
+            else:
+                status = response.status_code
+                if response.status_code not in RETRY_STATUS_CODES:
+                    breaker.record_success()
+                    return response
+                if last_attempt:
+                    breaker.record_failure()
+                    return response
+            time.sleep(backoff_delay(attempt))
+    finally:
+        metrics.record(metrics.upstream_seconds, time.perf_counter() - started, upstream=upstream, status=status)
+
+async def aget(upstream, url, params=None):
+    limiter = upstream_limiters.get(upstream)
+    if limiter is None:
+        return await aget_with_retries(upstream, url, params)
+    async with limiter.slot():
+        return await aget_with_retries(upstream, url, params)
+
+async def aget_with_retries(upstream, url, params=None):
+    breaker = get_breaker(upstream)
+    breaker.before_request()
+    started = time.perf_counter()
+    status = "error"
+
+    try:
+        for attempt in range(HTTP_MAX_RETRIES + 1):
+            last_attempt = attempt == HTTP_MAX_RETRIES
+            try:
+                response = await get_async_client().get(url, params=params)
+            except (httpx.TransportError, httpx.TimeoutException):
+                if last_attempt:
+                    breaker.record_failure()
+                    raise
+            except httpx.HTTPError:
+                breaker.record_failure()
+                raise
+            else:
+                status = response.status_code
+                if response.status_code not in RETRY_STATUS_CODES:
+                    breaker.record_success()
+                    return response
+                if last_attempt:
+                    breaker.record_failure()
+                    return response
+            await asyncio.sleep(backoff_delay(attempt))
+    finally:
+        metrics.record(metrics.upstream_seconds, time.perf_counter() - started, upstream=upstream, status=status)
+
+def breaker_stats():
+    with breakers_lock:
+        return {name: breaker.stats() for name, breaker in breakers.items()}
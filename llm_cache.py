@@ -0,0 +1,68 @@
+import hashlib
+import json
+import os
+import uuid
+from langchain_core.messages import AIMessage, ToolMessage
+from cache import TTLCache
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "3600"))
+LLM_CACHE_TOOL_TTL = int(os.getenv("LLM_CACHE_TOOL_TTL", "600"))
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "1000"))
+
+response_cache = TTLCache(LLM_CACHE_TTL, LLM_CACHE_SIZE)
+tool_response_cache = TTLCache(LLM_CACHE_TOOL_TTL, LLM_CACHE_SIZE)
+
+def normalize_content(content):
+    if isinstance(content, str):
+        return " ".join(content.split())
+    return json.dumps(content, sort_keys=True, ensure_ascii=False)
+
+def message_fingerprint(message):
+    fingerprint = [message.type, normalize_content(message.content)]
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        fingerprint.append([[tool_call["name"], tool_call["args"]] for tool_call in tool_calls])
+    return fingerprint
+
+def tools_fingerprint(tools):
+    payload = json.dumps(tools, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def response_key(messages, tools_key):
+    payload = json.dumps(
+        [tools_key, [message_fingerprint(message) for message in messages]],
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def cache_for(messages):
+    if any(isinstance(message, ToolMessage) for message in messages):
+        return tool_response_cache
+    return response_cache
+
+def get_cached_response(key, messages):
+    if not LLM_CACHE_ENABLED:
+        return None
+    cached = cache_for(messages).get(key)
+    if cached is None:
+        return None
+    content, tool_calls = cached
+    return AIMessage(
+        content=content,
+        tool_calls=[dict(tool_call, id=f"call_{uuid.uuid4().hex[:24]}") for tool_call in tool_calls]
+    )
+
+def store_response(key, messages, response):
+    if not LLM_CACHE_ENABLED or not (response.content or response.tool_calls):
+        return
+    tool_calls = [{"name": tool_call["name"], "args": tool_call["args"]} for tool_call in response.tool_calls]
+    cache_for(messages).set(key, (response.content, tool_calls))
+
+def llm_cache_stats():
+    return {
+        "enabled": LLM_CACHE_ENABLED,
+        "conversation": response_cache.stats(),
+        "with_tool_data": tool_response_cache.stats(),
+    }
@@ -1,24 +1,97 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
 import json
 import os
+import re
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from typing import Annotated
-from langgraph.graph import StateGraph, START, END
-from langgraph.graph.message import add_messages
 from typing_extensions import TypedDict
-from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage, SystemMessage
-from langgraph.checkpoint.memory import MemorySaver
-from tool import get_weather, search_hotels, search_flights
+from tool import WEATHER_API_URL, SERP_API_URL, aget_weather, asearch_hotels, asearch_flights, find_airport, cache_stats, project_tool_result
+from context import build_context, trip_dates, has_hotel_filters
+import http_client
+import metrics
+from airports import search_airports
+from router import route_message, render_reply
+from prefetch import schedule_prefetch, record_use, prefetch_stats
+from price_calendar import flight_price_calendar
+from results import retain_results, browse_results, results_stats
+from static_assets import get_assets, asset_response
+from frames import encode_frame, negotiate_encoding
+from llm_cache import get_cached_response, store_response, response_key, tools_fingerprint, llm_cache_stats
+from admission import AdmissionRejected, admission_stats, llm_limiter
 
 load_dotenv()
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+TOOL_CONCURRENCY = int(os.getenv("TOOL_CONCURRENCY", "4"))
+TOOL_TIMEOUT = float(os.getenv("TOOL_TIMEOUT", "20"))
+CONVERSATION_STORE = os.getenv("CONVERSATION_STORE", "memory")
+CONVERSATION_TTL = int(os.getenv("CONVERSATION_TTL", "3600"))
+CONVERSATION_MAX_BYTES = int(os.getenv("CONVERSATION_MAX_BYTES", str(256 * 1024 * 1024)))
+CONVERSATION_DB_PATH = os.getenv("CONVERSATION_DB_PATH", ".cache/conversations.sqlite3")
+CONVERSATION_COMPACT_INTERVAL = int(os.getenv("CONVERSATION_COMPACT_INTERVAL", "300"))
+GROQ_API_BASE = os.getenv("GROQ_API_BASE", "https://api.groq.com")
+WARMUP_UPSTREAMS = os.getenv("WARMUP_UPSTREAMS", "true").lower() in ("1", "true", "yes")
 
-app = FastAPI()
+SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{16,64}$")
+
+async def compact_periodically():
+    while True:
+        await asyncio.sleep(CONVERSATION_COMPACT_INTERVAL)
+        try:
+            await memory.acompact()
+        except Exception:
+            pass
+
+async def prewarm_upstreams():
+    targets = {"openweathermap": (WEATHER_API_URL, None), "serpapi": (SERP_API_URL, None)}
+    if llm_http_client is not None:
+        targets["groq"] = (GROQ_API_BASE, llm_http_client)
+    elapsed = await asyncio.gather(*(http_client.prewarm(url, client) for url, client in targets.values()))
+    return dict(zip(targets, elapsed))
+
+async def warm_up():
+    global memory
+    started = time.perf_counter()
+    if CONVERSATION_STORE == "sqlite":
+        from sqlite_store import open_sqlite_saver
+        memory = await open_sqlite_saver(CONVERSATION_DB_PATH, CONVERSATION_TTL)
+
+    try:
+        await asyncio.to_thread(get_graph)
+    except Exception as e:
+        startup["error"] = str(e)
+        raise
+    startup["graph_s"] = round(time.perf_counter() - started, 3)
+    if WARMUP_UPSTREAMS:
+        startup["upstream_ms"] = await prewarm_upstreams()
+    startup["warmup_s"] = round(time.perf_counter() - started, 3)
+    startup["ready"] = True
+
+async def wait_until_ready():
+    if not startup["ready"] and warmup_task is not None:
+        await asyncio.shield(warmup_task)
+
+@asynccontextmanager
+async def lifespan(app):
+    global warmup_task
+    get_assets()
+    warmup_task = asyncio.create_task(warm_up())
+    compaction_task = asyncio.create_task(compact_periodically())
+    yield
+    compaction_task.cancel()
+    warmup_task.cancel()
+    if CONVERSATION_STORE == "sqlite" and memory is not None:
+        await memory.conn.close()
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,16 +101,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.mount("/static", StaticFiles(directory="frontend"), name="static")
-
-llm = ChatGroq(
-    model="openai/gpt-oss-120b",
-    temperature=0,
-    api_key=GROQ_API_KEY
-)
-
-class State(TypedDict):
-    messages: Annotated[list, add_messages]
+def merge_turn_results(current, update):
+    if update is None:
+        return {}
+    merged = dict(current or {})
+    for result_type, data in update.items():
+        merged.setdefault(result_type, data)
+    return merged
 
 tools = [
     {
@@ -80,6 +150,14 @@ tools = [
                     "star_rating": {
                         "type": "integer",
                         "description": "Otel yıldız sayısı (2, 3, 4, veya 5, opsiyonel)"
+                    },
+                    "check_in_date": {
+                        "type": "string",
+                        "description": "Giriş tarihi (opsiyonel, YYYY-MM-DD). Aynı şehre uçuş arandıysa uçuşun gidiş tarihini kullan."
+                    },
+                    "check_out_date": {
+                        "type": "string",
+                        "description": "Çıkış tarihi (opsiyonel, YYYY-MM-DD). Dönüş uçuşu varsa dönüş tarihini kullan."
                     }
                 },
                 "required": ["location"]
@@ -96,11 +174,11 @@ tools = [
                 "properties": {
                     "departure": {
                         "type": "string",
-                        "description": "Kalkış havalimanı kodu (örn: IST, SAW, ESB, ADB)"
+                        "description": "Kalkış havalimanı kodu veya şehir adı (örn: IST, SAW, Ankara)"
                     },
                     "arrival": {
                         "type": "string",
-                        "description": "Varış havalimanı kodu (örn: CDG, JFK, LHR, AMS)"
+                        "description": "Varış havalimanı kodu veya şehir adı (örn: CDG, JFK, Londra)"
                     },
                     "outbound_date": {
                         "type": "string",
@@ -118,78 +196,341 @@ tools = [
                 "required": ["departure", "arrival", "outbound_date"]
             }
         }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "flight_price_calendar",
+            "description": "Esnek tarihli uçuşlar için fiyat takvimi: bir tarih aralığındaki her gün için en ucuz fiyatı tek seferde getirir. Kullanıcı hangi gün/hafta en ucuz diye sorarsa search_flights'ı gün gün çağırmak yerine bunu kullan.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "departure": {
+                        "type": "string",
+                        "description": "Kalkış havalimanı kodu veya şehir adı (örn: IST, Ankara)"
+                    },
+                    "arrival": {
+                        "type": "string",
+                        "description": "Varış havalimanı kodu veya şehir adı (örn: AMS, Londra)"
+                    },
+                    "start_date": {
+                        "type": "string",
+                        "description": "Aralığın ilk gidiş tarihi (YYYY-MM-DD)"
+                    },
+                    "days": {
+                        "type": "integer",
+                        "description": "Kaç günlük gidiş aralığı taranacak (varsayılan 7, en fazla 14)"
+                    },
+                    "min_nights": {
+                        "type": "integer",
+                        "description": "Gidiş-dönüş için en az kalış gecesi (opsiyonel; verilmezse tek yön)"
+                    },
+                    "max_nights": {
+                        "type": "integer",
+                        "description": "Gidiş-dönüş için en fazla kalış gecesi (opsiyonel)"
+                    },
+                    "adults": {
+                        "type": "integer",
+                        "description": "Yetişkin yolcu sayısı (varsayılan: 1)"
+                    }
+                },
+                "required": ["departure", "arrival", "start_date"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "find_airport",
+            "description": "Şehir veya havalimanı adından IATA havalimanı kodlarını bulur. Bir şehirde birden fazla havalimanı varsa hepsini döndürür.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Şehir, havalimanı adı veya kodu (örn: İstanbul, Sabiha, Münih)"
+                    }
+                },
+                "required": ["query"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "browse_results",
+            "description": "Bu sohbette son yapılan otel veya uçuş aramasının sonuçlarında yeni arama yapmadan gezinir: sonraki sayfayı getirir, sıralar veya filtreler. Kullanıcı daha fazla seçenek, en ucuz, en kısa, aktarmasız vb. isterse kullan.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "result_type": {
+                        "type": "string",
+                        "enum": ["hotels", "flights"],
+                        "description": "Sayfalanacak sonuç türü"
+                    },
+                    "sort_by": {
+                        "type": "string",
+                        "enum": ["price", "rating", "stars", "duration", "stops"],
+                        "description": "Sıralama ölçütü (rating/stars yalnızca otel, duration/stops yalnızca uçuş için). Verilmezse ve filtre de yoksa sonraki sayfa gelir."
+                    },
+                    "max_price": {
+                        "type": "integer",
+                        "description": "En yüksek fiyat (opsiyonel)"
+                    },
+                    "min_rating": {
+                        "type": "number",
+                        "description": "En düşük otel puanı (opsiyonel)"
+                    },
+                    "min_stars": {
+                        "type": "integer",
+                        "description": "En az otel yıldızı (opsiyonel)"
+                    },
+                    "max_stops": {
+                        "type": "integer",
+                        "description": "En fazla aktarma sayısı (opsiyonel, 0 = aktarmasız)"
+                    },
+                    "max_duration": {
+                        "type": "integer",
+                        "description": "En uzun toplam uçuş süresi, dakika (opsiyonel)"
+                    }
+                },
+                "required": ["result_type"]
+            }
+        }
     }
 ]
 
-llm_with_tools = llm.bind_tools(tools)
+tools_key = tools_fingerprint(tools)
 
-def chatbot(state: State):
-    messages = state["messages"]
-    
-    system_prompt = """Sen "TravelAI" adında profesyonel bir seyahat asistanısın.
+SYSTEM_PROMPT = """Sen "TravelAI" adında profesyonel bir seyahat asistanısın.
 KRİTİK KURALLAR:
 1. HAVA DURUMU: Kullanıcı hava durumu sorarsa → get_weather() kullan
 2. OTEL: Kullanıcı otel ararsa → search_hotels() kullan
-3. UÇUŞ: Kullanıcı uçuş ararsa → search_flights() kullan
-4. ASLA uydurma bilgi verme - her zaman tool'ları kullan!
+3. UÇUŞ: Kullanıcı uçuş ararsa → search_flights() kullan (şehir adı da verilebilir; havalimanından emin değilsen find_airport() kullan)
+4. ESNEK TARİH: "Hangi gün en ucuz?" gibi sorularda → flight_price_calendar() kullan, search_flights'ı gün gün çağırma
+5. DAHA FAZLA / SIRALAMA: Son otel veya uçuş sonuçlarında daha fazla seçenek, sıralama veya filtre istenirse → browse_results() kullan, aramayı tekrarlama
+6. ASLA uydurma bilgi verme - her zaman tool'ları kullan!
 KİŞİLİK:
 - Türkçe konuş, emoji kullan
 - Tarih belirtilmemişse sor (uçuş için tarih ZORUNLU)"""
-    
-    messages_with_system = [SystemMessage(content=system_prompt)] + messages
-    response = llm_with_tools.invoke(messages_with_system)
+
+system_message = SystemMessage(content=SYSTEM_PROMPT)
+
+llm_with_tools = None
+llm_http_client = None
+memory = None
+graph = None
+graph_lock = threading.Lock()
+warmup_task = None
+startup = {"ready": False}
+
+def create_llm():
+    global llm_http_client
+    from langchain_groq import ChatGroq
+    llm_http_client = http_client.create_async_client()
+    llm = ChatGroq(
+        model="openai/gpt-oss-120b",
+        temperature=0,
+        api_key=GROQ_API_KEY,
+        http_async_client=llm_http_client
+    )
+    return llm.bind_tools(tools)
+
+async def chatbot(state):
+    messages = state["messages"]
+
+    with metrics.timer(metrics.node_seconds, node="chatbot"):
+        messages_with_system = [system_message] + build_context(messages)
+        cache_key = response_key(messages_with_system, tools_key)
+        response = get_cached_response(cache_key, messages_with_system)
+        if response is not None:
+            metrics.llm_cache_lookups.inc(result="hit")
+            return {"messages": [response]}
+
+        metrics.llm_cache_lookups.inc(result="miss")
+        async with llm_limiter.slot():
+            with metrics.timer(metrics.llm_seconds):
+                response = await llm_with_tools.ainvoke(messages_with_system)
+        metrics.record_tokens(getattr(response, "usage_metadata", None))
+        store_response(cache_key, messages_with_system, response)
     return {"messages": [response]}
 
-def tool_node(state: State):
+async def run_weather(args, thread_id):
+    return await aget_weather(args["city"], args.get("days", 1))
+
+async def run_hotels(args, thread_id):
+    return await asearch_hotels(
+        args["location"],
+        args.get("budget"),
+        args.get("star_rating"),
+        args.get("check_in_date"),
+        args.get("check_out_date")
+    )
+
+async def run_flights(args, thread_id):
+    return await asearch_flights(
+        args["departure"],
+        args["arrival"],
+        args["outbound_date"],
+        args.get("return_date"),
+        args.get("adults", 1)
+    )
+
+async def run_price_calendar(args, thread_id):
+    return await flight_price_calendar(
+        args["departure"],
+        args["arrival"],
+        args["start_date"],
+        args.get("days", 7),
+        args.get("min_nights"),
+        args.get("max_nights"),
+        args.get("adults", 1)
+    )
+
+async def run_find_airport(args, thread_id):
+    return find_airport(args["query"])
+
+browse_filters = ("max_price", "min_rating", "min_stars", "max_stops", "max_duration")
+
+async def run_browse_results(args, thread_id):
+    filters = {name: args[name] for name in browse_filters if args.get(name) is not None}
+    data = browse_results(thread_id, args.get("result_type"), args.get("sort_by"), filters)
+    if "error" not in data:
+        metrics.result_pages.inc(result_type=data["page"]["result_type"], source="tool")
+    return data
+
+tool_functions = {
+    "get_weather": run_weather,
+    "search_hotels": run_hotels,
+    "search_flights": run_flights,
+    "flight_price_calendar": run_price_calendar,
+    "find_airport": run_find_airport,
+    "browse_results": run_browse_results,
+}
+
+tool_result_types = {
+    "get_weather": "weather",
+    "search_hotels": "hotels",
+    "search_flights": "flights",
+}
+
+paged_result_types = ("hotels", "flights")
+
+def turn_result_type(tool_call, data):
+    if tool_call["name"] == "browse_results":
+        return data["page"]["result_type"]
+    return tool_result_types.get(tool_call["name"])
+
+def with_trip_dates(tool_call, messages):
+    args = tool_call["args"]
+    if tool_call["name"] != "search_hotels" or args.get("check_in_date") or not args.get("location"):
+        return tool_call
+    check_in_date, check_out_date = trip_dates(messages, args["location"])
+    if not check_in_date:
+        return tool_call
+    return dict(tool_call, args=dict(args, check_in_date=check_in_date, check_out_date=check_out_date))
+
+def emit_result(result_type, data):
+    from langgraph.config import get_stream_writer
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        return
+    writer({"result_type": result_type, "data": data})
+
+async def run_tool_call(tool_call, semaphore, thread_id):
+    tool_function = tool_functions.get(tool_call["name"])
+    if tool_function is None:
+        return ToolMessage(content=f"Bilinmeyen araç: {tool_call['name']}", tool_call_id=tool_call["id"]), None
+
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        record_use(tool_call["name"], tool_call["args"])
+        async with semaphore:
+            data = await asyncio.wait_for(tool_function(tool_call["args"], thread_id), timeout=TOOL_TIMEOUT)
+    except asyncio.TimeoutError:
+        outcome = "timeout"
+        data = {"error": f"{tool_call['name']} zaman aşımına uğradı ({TOOL_TIMEOUT:g} sn)"}
+    except Exception as e:
+        outcome = "exception"
+        data = {"error": f"{tool_call['name']} çalıştırılamadı: {str(e)}"}
+
+    if outcome == "ok" and "error" in data:
+        outcome = "error"
+    metrics.record(metrics.tool_seconds, time.perf_counter() - started, tool=tool_call["name"], outcome=outcome)
+
+    if "error" in data:
+        return ToolMessage(content=data["error"], tool_call_id=tool_call["id"]), None
+
+    result_type = tool_result_types.get(tool_call["name"])
+    if result_type in paged_result_types:
+        data = retain_results(thread_id, result_type, data)
+
+    turn_type = turn_result_type(tool_call, data)
+    if turn_type:
+        emit_result(turn_type, data)
+
+    slim = project_tool_result(tool_call["name"], data)
+    result = json.dumps(slim, ensure_ascii=False, separators=(",", ":"))
+    return ToolMessage(content=result, tool_call_id=tool_call["id"]), data
+
+async def tool_node(state, config):
     messages = state["messages"]
     last_message = messages[-1]
-    tool_results = []
-    
-    if hasattr(last_message, 'tool_calls') and last_message.tool_calls:
-        for tool_call in last_message.tool_calls:
-            if tool_call["name"] == "get_weather":
-                city = tool_call["args"]["city"]
-                days = tool_call["args"].get("days", 1)
-                weather_data = get_weather(city, days)
-                
-                if "error" in weather_data:
-                    result = weather_data["error"]
-                else:
-                    result = json.dumps(weather_data)
-                
-                tool_results.append(ToolMessage(content=result, tool_call_id=tool_call["id"]))
-                
-            elif tool_call["name"] == "search_hotels":
-                location = tool_call["args"]["location"]
-                budget = tool_call["args"].get("budget")
-                star_rating = tool_call["args"].get("star_rating")
-                hotel_data = search_hotels(location, budget, star_rating)
-                
-                if "error" in hotel_data:
-                    result = hotel_data["error"]
-                else:
-                    result = json.dumps(hotel_data)
-                
-                tool_results.append(ToolMessage(content=result, tool_call_id=tool_call["id"]))
-                
-            elif tool_call["name"] == "search_flights":
-                departure = tool_call["args"]["departure"]
-                arrival = tool_call["args"]["arrival"]
-                outbound_date = tool_call["args"]["outbound_date"]
-                return_date = tool_call["args"].get("return_date")
-                adults = tool_call["args"].get("adults", 1)
-                flight_data = search_flights(departure, arrival, outbound_date, return_date, adults)
-                
-                if "error" in flight_data:
-                    result = flight_data["error"]
-                else:
-                    result = json.dumps(flight_data)
-                
-                tool_results.append(ToolMessage(content=result, tool_call_id=tool_call["id"]))
-    
-    return {"messages": tool_results}
 
-def should_continue(state: State):
+    if not (hasattr(last_message, 'tool_calls') and last_message.tool_calls):
+        return {"messages": []}
+
+    thread_id = config["configurable"]["thread_id"]
+    tool_calls = [with_trip_dates(tool_call, messages) for tool_call in last_message.tool_calls]
+    semaphore = asyncio.Semaphore(TOOL_CONCURRENCY)
+    with metrics.timer(metrics.node_seconds, node="tools"):
+        tool_results = await asyncio.gather(
+            *(run_tool_call(tool_call, semaphore, thread_id) for tool_call in tool_calls)
+        )
+
+    turn_results = {}
+    for tool_call, (_, data) in zip(tool_calls, tool_results):
+        if data is not None:
+            schedule_prefetch(thread_id, tool_call["name"], tool_call["args"], data)
+            result_type = turn_result_type(tool_call, data)
+            if result_type:
+                turn_results.setdefault(result_type, data)
+    return {"messages": [message for message, _ in tool_results], "turn_results": turn_results}
+
+async def fast_path(state, config):
+    tool_call = dict(route_message(state["messages"][-1].content), id=f"fast_{uuid.uuid4().hex[:12]}")
+    tool_call = with_trip_dates(tool_call, state["messages"])
+    with metrics.timer(metrics.node_seconds, node="fast_path"):
+        tool_message, data = await run_tool_call(tool_call, asyncio.Semaphore(1), config["configurable"]["thread_id"])
+
+    messages = [AIMessage(content="", tool_calls=[tool_call]), tool_message]
+    if data is None:
+        metrics.fast_path_turns.inc(tool=tool_call["name"], outcome="fallback")
+        return {"messages": messages}
+
+    metrics.fast_path_turns.inc(tool=tool_call["name"], outcome="served")
+    schedule_prefetch(config["configurable"]["thread_id"], tool_call["name"], tool_call["args"], data)
+    messages.append(AIMessage(content=render_reply(tool_call["name"], data)))
+    return {"messages": messages, "turn_results": {tool_result_types[tool_call["name"]]: data}}
+
+def route_turn(state):
+    last_message = state["messages"][-1]
+    tool_call = route_message(last_message.content) if isinstance(last_message, HumanMessage) else None
+    if tool_call is None:
+        return "chatbot"
+    if tool_call["name"] == "search_hotels" and has_hotel_filters(state["messages"]):
+        metrics.fast_path_turns.inc(tool=tool_call["name"], outcome="context")
+        return "chatbot"
+    return "fast_path"
+
+def after_fast_path(state):
+    if isinstance(state["messages"][-1], ToolMessage):
+        return "chatbot"
+    return "end"
+
+def should_continue(state):
     messages = state["messages"]
     last_message = messages[-1]
     
@@ -197,94 +538,229 @@ def should_continue(state: State):
         return "tools"
     return "end"
 
-graph_builder = StateGraph(State)
-graph_builder.add_node("chatbot", chatbot)
-graph_builder.add_node("tools", tool_node)
+def build_graph(checkpointer):
+    from langgraph.graph import StateGraph, START, END
+    from langgraph.graph.message import add_messages
 
-graph_builder.add_edge(START, "chatbot")
-graph_builder.add_conditional_edges("chatbot", should_continue, {"tools": "tools", "end": END})
-graph_builder.add_edge("tools", "chatbot")
+    class State(TypedDict):
+        messages: Annotated[list, add_messages]
+        turn_results: Annotated[dict, merge_turn_results]
 
-memory = MemorySaver()
-graph = graph_builder.compile(checkpointer=memory)
+    graph_builder = StateGraph(State)
+    graph_builder.add_node("chatbot", chatbot)
+    graph_builder.add_node("tools", tool_node)
+    graph_builder.add_node("fast_path", fast_path)
+
+    graph_builder.add_conditional_edges(START, route_turn, {"fast_path": "fast_path", "chatbot": "chatbot"})
+    graph_builder.add_conditional_edges("fast_path", after_fast_path, {"chatbot": "chatbot", "end": END})
+    graph_builder.add_conditional_edges("chatbot", should_continue, {"tools": "tools", "end": END})
+    graph_builder.add_edge("tools", "chatbot")
+    return graph_builder.compile(checkpointer=checkpointer)
+
+def get_graph():
+    global llm_with_tools, memory, graph
+    with graph_lock:
+        if graph is None:
+            if llm_with_tools is None:
+                llm_with_tools = create_llm()
+            if memory is None:
+                from session_store import BoundedMemorySaver
+                memory = BoundedMemorySaver(CONVERSATION_TTL, CONVERSATION_MAX_BYTES)
+            graph = build_graph(memory)
+        return graph
 
 @app.get("/")
-async def get():
-    with open("frontend/index.html", encoding="utf-8") as f:
-        return HTMLResponse(content=f.read())
+async def get(request: Request):
+    return asset_response("index.html", request)
+
+@app.get("/static/{name}")
+async def get_static(name: str, request: Request):
+    return asset_response(name, request)
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    return {**cache_stats(), "llm": llm_cache_stats(), "prefetch": prefetch_stats(), "results": results_stats()}
+
+@app.get("/sessions/stats")
+async def get_session_stats():
+    await wait_until_ready()
+    get_graph()
+    return await memory.astats()
+
+@app.get("/ready")
+async def get_readiness():
+    return JSONResponse(startup, status_code=200 if startup["ready"] else 503)
+
+@app.get("/airports/autocomplete")
+async def autocomplete_airports(q: str = "", limit: int = 8):
+    return {"query": q, "airports": search_airports(q, max(1, min(limit, 20)))}
+
+@app.get("/flights/calendar")
+async def get_price_calendar(
+    departure: str,
+    arrival: str,
+    start_date: str,
+    days: int = 7,
+    min_nights: int | None = None,
+    max_nights: int | None = None,
+    adults: int = 1
+):
+    return await flight_price_calendar(departure, arrival, start_date, days, min_nights, max_nights, adults)
+
+@app.get("/admission/stats")
+async def get_admission_stats():
+    return admission_stats()
+
+@app.get("/metrics")
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+async def send_frame(websocket, frame):
+    encoding = getattr(websocket.state, "frame_encoding", "json")
+    with metrics.timer(metrics.send_seconds, type=frame["type"]):
+        payload = encode_frame(frame, encoding)
+        if isinstance(payload, bytes):
+            await websocket.send_bytes(payload)
+            size = len(payload)
+        else:
+            await websocket.send_text(payload)
+            size = len(payload.encode("utf-8"))
+    metrics.frame_bytes.observe(size, type=frame["type"], encoding=encoding)
+
+async def run_turn(websocket, state, config):
+    final_state = await get_graph().ainvoke(state, config=config)
+    results = final_state.get("turn_results") or {}
+
+    for result_type in ("hotels", "weather", "flights"):
+        if result_type in results:
+            await send_frame(websocket, {"type": result_type, "data": results[result_type]})
+
+    last_message = final_state["messages"][-1]
+    if not results and isinstance(last_message, AIMessage) and last_message.content:
+        await send_frame(websocket, {"type": "message", "content": last_message.content})
+
+async def stream_turn(websocket, state, config):
+    sent_results = set()
+
+    async for mode, chunk in get_graph().astream(state, config=config, stream_mode=["messages", "updates", "custom"]):
+        if mode == "messages":
+            message_chunk, metadata = chunk
+            if metadata.get("langgraph_node") != "chatbot" or sent_results:
+                continue
+            if isinstance(message_chunk.content, str) and message_chunk.content:
+                await send_frame(websocket, {"type": "delta", "content": message_chunk.content})
+
+        elif mode == "custom":
+            if chunk.get("result_type") and chunk["result_type"] not in sent_results:
+                sent_results.add(chunk["result_type"])
+                await send_frame(websocket, {"type": chunk["result_type"], "data": chunk["data"]})
+
+        elif mode == "updates":
+            update = chunk.get("tools") or chunk.get("fast_path") or {}
+            for result_type, data in (update.get("turn_results") or {}).items():
+                if result_type not in sent_results:
+                    sent_results.add(result_type)
+                    await send_frame(websocket, {"type": result_type, "data": data})
+
+async def send_more_results(websocket, thread_id, message_data):
+    result_type = message_data.get("more")
+    filters = message_data.get("filters") or {}
+    data = browse_results(thread_id, result_type, message_data.get("sort_by"), filters)
+    if "error" in data:
+        await send_frame(websocket, {"type": "error", "content": data["error"]})
+        return
+    metrics.result_pages.inc(result_type=result_type, source="websocket")
+    await send_frame(websocket, {"type": result_type, "data": data})
+
+async def handle_turn(websocket, thread_id, user_message, stream, want_timings):
+    state = {"messages": [HumanMessage(content=user_message)], "turn_results": None}
+    config = {"configurable": {"thread_id": thread_id}}
+
+    timings = metrics.start_turn_timings(want_timings)
+    started = time.perf_counter()
+    try:
+        if stream:
+            await stream_turn(websocket, state, config)
+        else:
+            await run_turn(websocket, state, config)
+    except AdmissionRejected as e:
+        await send_frame(websocket, {"type": "busy", "content": str(e)})
+    except Exception as e:
+        await send_frame(websocket, {"type": "error", "content": f"Bir hata oluştu: {str(e)}"})
+    elapsed = time.perf_counter() - started
+    metrics.record(metrics.turn_seconds, elapsed, mode="stream" if stream else "buffered")
+
+    if timings is not None:
+        await send_frame(websocket, {"type": "timings", "data": {"total_ms": round(elapsed * 1000, 1), "spans": timings}})
+
+    if stream:
+        await send_frame(websocket, {"type": "done"})
+
+async def cancel_turn(turn):
+    if turn is None or turn.done():
+        return False
+    turn.cancel()
+    try:
+        await turn
+    except asyncio.CancelledError:
+        pass
+    metrics.turns_cancelled.inc()
+    return True
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
-    thread_id = f"user_{id(websocket)}"
+    websocket.state.frame_encoding = negotiate_encoding(websocket.query_params.get("encoding"))
+    session_id = websocket.query_params.get("session_id", "")
+    resumable = bool(SESSION_ID_PATTERN.match(session_id))
+    if not resumable:
+        session_id = uuid.uuid4().hex
+    thread_id = f"user_{session_id}"
+    current_turn = None
+
+    await wait_until_ready()
+    resumed = resumable and await get_graph().checkpointer.aget_tuple({"configurable": {"thread_id": thread_id}}) is not None
+    await send_frame(websocket, {
+        "type": "session",
+        "session_id": session_id,
+        "resumed": resumed,
+        "encoding": websocket.state.frame_encoding
+    })
     
     try:
         while True:
             data = await websocket.receive_text()
             message_data = json.loads(data)
             user_message = message_data.get("message", "")
+
+            if message_data.get("more") and not user_message:
+                await send_more_results(websocket, thread_id, message_data)
+                continue
+
+            if message_data.get("cancel") or user_message:
+                if await cancel_turn(current_turn):
+                    await send_frame(websocket, {"type": "cancelled"})
             
             if not user_message:
                 continue
-            
-            try:
-                state = {"messages": [HumanMessage(content=user_message)]}
-                config = {"configurable": {"thread_id": thread_id}}
-                final_state = graph.invoke(state, config=config)
-                
-                messages = final_state["messages"]
-                last_ai_message = None
-                weather_data = None
-                hotel_data = None
-                flight_data = None
-                
-                last_human_index = -1
-                for i, msg in enumerate(messages):
-                    if isinstance(msg, HumanMessage):
-                        last_human_index = i
-                
-                for msg in reversed(messages):
-                    if isinstance(msg, AIMessage) and not last_ai_message:
-                        if not (hasattr(msg, 'tool_calls') and msg.tool_calls):
-                            last_ai_message = msg
-                            break
-                
-                if last_human_index >= 0:
-                    recent_messages = messages[last_human_index + 1:]
-                    
-                    for msg in recent_messages:
-                        if isinstance(msg, ToolMessage):
-                            try:
-                                parsed_data = json.loads(msg.content)
-                                if "hotels" in parsed_data and not hotel_data:
-                                    hotel_data = parsed_data
-                                elif "forecasts" in parsed_data and not weather_data:
-                                    weather_data = parsed_data
-                                elif "flights" in parsed_data and not flight_data:
-                                    flight_data = parsed_data
-                            except:
-                                pass
-                
-                if hotel_data and "error" not in hotel_data:
-                    await websocket.send_text(json.dumps({"type": "hotels", "data": hotel_data}))
-                
-                if weather_data and "error" not in weather_data:
-                    await websocket.send_text(json.dumps({"type": "weather", "data": weather_data}))
-                
-                if flight_data and "error" not in flight_data:
-                    await websocket.send_text(json.dumps({"type": "flights", "data": flight_data}))
-                
-                if not hotel_data and not weather_data and not flight_data and last_ai_message and last_ai_message.content:
-                    await websocket.send_text(json.dumps({"type": "message", "content": last_ai_message.content}))
-                
-            except Exception as e:
-                await websocket.send_text(json.dumps({"type": "error", "content": f"Bir hata oluştu: {str(e)}"}))
+
+            current_turn = asyncio.create_task(handle_turn(
+                websocket,
+                thread_id,
+                user_message,
+                message_data.get("stream", False),
+                message_data.get("timings", False)
+            ))
             
     except WebSocketDisconnect:
         pass
     except:
         pass
+    finally:
+        await cancel_turn(current_turn)
+        if CONVERSATION_STORE == "memory" and not resumable:
+            await memory.adelete_thread(thread_id)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, port=8002)
\ No newline at end of file
+    uvicorn.run(app, port=8002, ws_per_message_deflate=True)
\ No newline at end of file
@@ -0,0 +1,140 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BYTE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144)
+
+class Histogram:
+    def __init__(self, name, help_text, label_names, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for key, series in sorted(self.series.items()):
+                labels = [f'{name}="{escape(value)}"' for name, value in zip(self.label_names, key)]
+                for bound, count in zip(self.buckets, series["counts"]):
+                    lines.append(f"{self.name}_bucket{format_labels(labels + [bucket_label(f'{bound:g}')])} {count}")
+                lines.append(f"{self.name}_bucket{format_labels(labels + [bucket_label('+Inf')])} {series['count']}")
+                lines.append(f"{self.name}_sum{format_labels(labels)} {series['sum']:.6f}")
+                lines.append(f"{self.name}_count{format_labels(labels)} {series['count']}")
+        return lines
+
+class Counter:
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self.lock:
+            self.series[key] = self.series.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            for key, value in sorted(self.series.items()):
+                labels = [f'{name}="{escape(value)}"' for name, value in zip(self.label_names, key)]
+                lines.append(f"{self.name}{format_labels(labels)} {value}")
+        return lines
+
+def escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def bucket_label(bound):
+    return 'le="' + bound + '"'
+
+def format_labels(labels):
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+turn_seconds = Histogram("travelai_turn_seconds", "WebSocket turn latency", ("mode",))
+node_seconds = Histogram("travelai_node_seconds", "LangGraph node latency", ("node",))
+llm_seconds = Histogram("travelai_llm_seconds", "LLM call latency", ())
+tool_seconds = Histogram("travelai_tool_seconds", "Tool call latency including cache lookups", ("tool", "outcome"))
+upstream_seconds = Histogram("travelai_upstream_seconds", "Upstream HTTP request latency including retries", ("upstream", "status"))
+parse_seconds = Histogram("travelai_parse_seconds", "Upstream response parsing time", ("tool",))
+checkpoint_seconds = Histogram("travelai_checkpoint_seconds", "Conversation checkpoint write time", ("store",))
+send_seconds = Histogram("travelai_ws_send_seconds", "WebSocket frame serialization and send time", ("type",))
+frame_bytes = Histogram("travelai_ws_frame_bytes", "WebSocket frame payload size before permessage-deflate", ("type", "encoding"), BYTE_BUCKETS)
+admission_wait_seconds = Histogram("travelai_admission_wait_seconds", "Time spent queued for an LLM or upstream slot", ("limiter",))
+admission_rejected = Counter("travelai_admission_rejected_total", "Requests rejected by admission control", ("limiter", "reason"))
+turns_cancelled = Counter("travelai_turns_cancelled_total", "Turns cancelled by a newer message or an explicit cancel", ())
+fast_path_turns = Counter("travelai_fast_path_turns_total", "Turns answered by the rule-based router without the LLM", ("tool", "outcome"))
+llm_cache_lookups = Counter("travelai_llm_cache_lookups_total", "LLM response cache lookups", ("result",))
+prefetches = Counter("travelai_prefetch_total", "Speculative prefetches by outcome", ("tool", "outcome"))
+prefetch_hits = Counter("travelai_prefetch_hits_total", "Tool calls answered by an earlier prefetch", ("tool",))
+llm_tokens = Counter("travelai_llm_tokens_total", "LLM tokens reported by the provider", ("kind",))
+result_pages = Counter("travelai_result_pages_total", "Result pages served from retained search results", ("result_type", "source"))
+
+registry = [
+    turn_seconds, node_seconds, llm_seconds, tool_seconds, upstream_seconds,
+    parse_seconds, checkpoint_seconds, send_seconds, frame_bytes, admission_wait_seconds,
+    admission_rejected, turns_cancelled, fast_path_turns, llm_cache_lookups,
+    prefetches, prefetch_hits, llm_tokens, result_pages,
+]
+
+turn_timings = ContextVar("turn_timings", default=None)
+
+def start_turn_timings(enabled=True):
+    timings = {} if enabled else None
+    turn_timings.set(timings)
+    return timings
+
+def span_name(histogram, labels):
+    name = histogram.name.removeprefix("travelai_").removesuffix("_seconds")
+    return ".".join([name] + [str(value) for value in labels.values()])
+
+def record(histogram, seconds, **labels):
+    histogram.observe(seconds, **labels)
+    timings = turn_timings.get()
+    if timings is not None:
+        entry = timings.setdefault(span_name(histogram, labels), {"ms": 0.0, "count": 0})
+        entry["ms"] = round(entry["ms"] + seconds * 1000, 2)
+        entry["count"] += 1
+
+@contextmanager
+def timer(histogram, **labels):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(histogram, time.perf_counter() - start, **labels)
+
+def record_tokens(usage):
+    if not usage:
+        return
+    llm_tokens.inc(usage.get("input_tokens", 0), kind="prompt")
+    llm_tokens.inc(usage.get("output_tokens", 0), kind="completion")
+    timings = turn_timings.get()
+    if timings is not None:
+        tokens = timings.setdefault("llm.tokens", {"prompt": 0, "completion": 0})
+        tokens["prompt"] += usage.get("input_tokens", 0)
+        tokens["completion"] += usage.get("output_tokens", 0)
+
+def render():
+    lines = []
+    for metric in registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
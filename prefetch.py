@@ -0,0 +1,138 @@
+import asyncio
+import os
+import metrics
+from admission import RateBudget, upstream_limiters
+from airports import airports
+from cache import TTLCache, normalize_key
+from tool import aget_weather, asearch_hotels, build_hotel_params, serp_cache, serp_cache_key, weather_cache_for
+
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() in ("1", "true", "yes")
+PREFETCH_SESSION_BUDGET = int(os.getenv("PREFETCH_SESSION_BUDGET", "4"))
+PREFETCH_SERP_PER_MINUTE = int(os.getenv("PREFETCH_SERP_PER_MINUTE", "10"))
+PREFETCH_TRACK_TTL = int(os.getenv("PREFETCH_TRACK_TTL", "1800"))
+
+session_spend = TTLCache(PREFETCH_TRACK_TTL, 10000)
+prefetched = TTLCache(PREFETCH_TRACK_TTL, 5000)
+serp_budget = RateBudget("prefetch_serpapi", PREFETCH_SERP_PER_MINUTE)
+tasks = set()
+counts = {"started": 0, "used": 0, "skipped": 0, "failed": 0}
+
+def prefetch_key(tool_name, args):
+    if tool_name == "get_weather":
+        days = max(1, min(5, args.get("days", 1)))
+        return ("forecast" if days > 1 else "weather", normalize_key(args["city"]))
+    if tool_name == "search_hotels":
+        params = build_hotel_params(
+            args["location"],
+            args.get("budget"),
+            args.get("star_rating"),
+            args.get("check_in_date"),
+            args.get("check_out_date")
+        )
+        return ("serpapi", serp_cache_key(params))
+    return None
+
+async def is_cached(tool_name, args, key):
+    if tool_name == "get_weather":
+        return weather_cache_for(max(1, min(5, args.get("days", 1)))).contains(key[1])
+    return await serp_cache.ais_fresh(key[1])
+
+def plan_prefetches(tool_name, args, data):
+    if tool_name == "search_flights":
+        airport = airports.get(str(data.get("arrival", "")).upper())
+        if airport is None:
+            return []
+        city = airport[1]
+        return [
+            ("get_weather", {"city": city}),
+            ("search_hotels", {
+                "location": city,
+                "check_in_date": data.get("outbound_date"),
+                "check_out_date": data.get("return_date"),
+            }),
+        ]
+    if tool_name == "search_hotels":
+        return [("get_weather", {"city": args["location"]})]
+    return []
+
+def take_serp_slot():
+    limiter = upstream_limiters.get("serpapi")
+    if limiter is not None and (limiter.waiting or limiter.active >= limiter.max_concurrent):
+        return False
+    return serp_budget.take()
+
+def skip(tool_name, reason):
+    counts["skipped"] += 1
+    metrics.prefetches.inc(tool=tool_name, outcome=reason)
+
+async def run_prefetch(tool_name, args, key):
+    metrics.turn_timings.set(None)
+    try:
+        if tool_name == "get_weather":
+            data = await aget_weather(args["city"], args.get("days", 1))
+        else:
+            data = await asearch_hotels(
+                args["location"],
+                check_in_date=args.get("check_in_date"),
+                check_out_date=args.get("check_out_date")
+            )
+    except Exception as e:
+        data = {"error": str(e)}
+    if "error" in data:
+        prefetched.pop(key)
+        counts["failed"] += 1
+        metrics.prefetches.inc(tool=tool_name, outcome="error")
+
+async def start_prefetch(thread_id, tool_name, args, key):
+    if await is_cached(tool_name, args, key):
+        skip(tool_name, "cached")
+        return
+
+    spent = session_spend.get(thread_id) or 0
+    if spent >= PREFETCH_SESSION_BUDGET:
+        skip(tool_name, "session_budget")
+        return
+    if tool_name == "search_hotels" and not take_serp_slot():
+        skip(tool_name, "rate_budget")
+        return
+
+    session_spend.set(thread_id, spent + 1)
+    prefetched.set(key, tool_name)
+    counts["started"] += 1
+    metrics.prefetches.inc(tool=tool_name, outcome="started")
+    await run_prefetch(tool_name, args, key)
+
+def schedule_prefetch(thread_id, tool_name, args, data):
+    if not PREFETCH_ENABLED or not isinstance(data, dict) or "error" in data:
+        return
+
+    try:
+        planned = plan_prefetches(tool_name, args, data)
+    except Exception:
+        return
+
+    for prefetch_tool, prefetch_args in planned:
+        try:
+            key = prefetch_key(prefetch_tool, prefetch_args)
+        except Exception:
+            continue
+        task = asyncio.create_task(start_prefetch(thread_id, prefetch_tool, prefetch_args, key))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+def record_use(tool_name, args):
+    try:
+        key = prefetch_key(tool_name, args)
+    except Exception:
+        return
+    if key is not None and prefetched.pop(key) is not None:
+        counts["used"] += 1
+        metrics.prefetch_hits.inc(tool=tool_name)
+
+def prefetch_stats():
+    return {
+        "enabled": PREFETCH_ENABLED,
+        **counts,
+        "hit_rate": round(counts["used"] / counts["started"], 3) if counts["started"] else None,
+        "inflight": len(tasks),
+    }
@@ -0,0 +1,109 @@
+import asyncio
+import os
+from datetime import date, timedelta
+from admission import RateBudget
+from tool import asearch_flights, build_flight_params, resolve_flight_airports, serp_cache, serp_cache_key
+
+CALENDAR_MAX_DAYS = int(os.getenv("CALENDAR_MAX_DAYS", "14"))
+CALENDAR_MAX_QUERIES = int(os.getenv("CALENDAR_MAX_QUERIES", "28"))
+CALENDAR_CONCURRENCY = int(os.getenv("CALENDAR_CONCURRENCY", "7"))
+CALENDAR_SERP_PER_MINUTE = int(os.getenv("CALENDAR_SERP_PER_MINUTE", "60"))
+CALENDAR_DEADLINE = float(os.getenv("CALENDAR_DEADLINE", "15"))
+
+serp_budget = RateBudget("calendar_serpapi", CALENDAR_SERP_PER_MINUTE)
+
+def calendar_queries(start_date, days, min_nights=None, max_nights=None):
+    start = date.fromisoformat(start_date)
+    outbound_dates = [(start + timedelta(days=offset)).isoformat() for offset in range(days)]
+    if min_nights is None and max_nights is None:
+        return outbound_dates, [], [(outbound, None) for outbound in outbound_dates]
+
+    min_nights = max(1, min_nights if min_nights is not None else max_nights)
+    max_nights = max(min_nights, max_nights if max_nights is not None else min_nights)
+    nights = list(range(min_nights, max_nights + 1))
+    queries = [
+        (outbound, (date.fromisoformat(outbound) + timedelta(days=stay)).isoformat())
+        for outbound in outbound_dates
+        for stay in nights
+    ]
+    return outbound_dates, nights, queries
+
+def cheapest_option(data):
+    options = [flight for flight in data.get("flights", []) if isinstance(flight.get("price"), (int, float))]
+    if not options:
+        return None
+    best = min(options, key=lambda flight: flight["price"])
+    return best["price"], max(0, len(best.get("flights", [])) - 1)
+
+async def flight_price_calendar(departure, arrival, start_date, days=7, min_nights=None, max_nights=None, adults=1):
+    departure_code, arrival_code, error = resolve_flight_airports(departure, arrival)
+    if error:
+        return error
+
+    days = max(1, min(CALENDAR_MAX_DAYS, days or 7))
+    try:
+        outbound_dates, nights, queries = calendar_queries(start_date, days, min_nights, max_nights)
+    except (TypeError, ValueError):
+        return {"error": f"Geçersiz başlangıç tarihi: {start_date} (YYYY-MM-DD bekleniyor)"}
+    if len(queries) > CALENDAR_MAX_QUERIES:
+        return {"error": f"Çok fazla tarih kombinasyonu ({len(queries)}), en fazla {CALENDAR_MAX_QUERIES}: gün aralığını veya kalış gecesi aralığını daraltın"}
+
+    semaphore = asyncio.Semaphore(CALENDAR_CONCURRENCY)
+
+    async def price_for(outbound, inbound):
+        params = build_flight_params(departure_code, arrival_code, outbound, inbound, adults)
+        if await serp_cache.ais_fresh(serp_cache_key(params)):
+            source = "cached"
+        elif serp_budget.take():
+            source = "fetched"
+        else:
+            return "skipped", None
+
+        async with semaphore:
+            data = await asearch_flights(departure_code, arrival_code, outbound, inbound, adults)
+        if "error" in data:
+            return "failed", None
+        return source, cheapest_option(data)
+
+    tasks = [asyncio.ensure_future(price_for(outbound, inbound)) for outbound, inbound in queries]
+    try:
+        done, pending = await asyncio.wait(tasks, timeout=CALENDAR_DEADLINE)
+    except asyncio.CancelledError:
+        for task in tasks:
+            task.cancel()
+        raise
+    for task in pending:
+        task.cancel()
+
+    counts = {"total": len(queries), "cached": 0, "fetched": 0, "skipped": 0, "failed": 0}
+    options = []
+    for task in tasks:
+        if task in done and task.exception() is None:
+            outcome, option = task.result()
+        else:
+            outcome, option = ("skipped" if task in pending else "failed"), None
+        counts[outcome] += 1
+        options.append(option)
+
+    cheapest = None
+    for (outbound, inbound), option in zip(queries, options):
+        if option is not None and (cheapest is None or option[0] < cheapest["price"]):
+            cheapest = {"outbound_date": outbound, "return_date": inbound, "price": option[0], "stops": option[1]}
+
+    if cheapest is None and counts["failed"] + counts["skipped"] == counts["total"]:
+        return {"error": f"{departure_code}→{arrival_code} için fiyat takvimi alınamadı, lütfen biraz sonra tekrar deneyin"}
+
+    prices = [option[0] if option else None for option in options]
+    if nights:
+        prices = [prices[row * len(nights):(row + 1) * len(nights)] for row in range(len(outbound_dates))]
+
+    return {
+        "departure": departure_code,
+        "arrival": arrival_code,
+        "currency": "TRY",
+        "outbound_dates": outbound_dates,
+        "nights": nights,
+        "prices": prices,
+        "cheapest": cheapest,
+        "queries": counts,
+    }
@@ -0,0 +1,159 @@
+import os
+import sys
+from cache import TTLCache
+
+RESULTS_PAGE_SIZE = int(os.getenv("RESULTS_PAGE_SIZE", "5"))
+RESULTS_TTL = int(os.getenv("RESULTS_TTL", "1800"))
+RESULTS_MAX_SESSIONS = int(os.getenv("RESULTS_MAX_SESSIONS", "5000"))
+RESULTS_MAX_ITEMS = int(os.getenv("RESULTS_MAX_ITEMS", "100"))
+RESULTS_MAX_BYTES = int(os.getenv("RESULTS_MAX_BYTES", str(64 * 1024 * 1024)))
+
+MISSING = float("inf")
+
+HOTEL_FIELDS = (
+    "name", "overall_rating", "reviews", "hotel_class", "rate_per_night", "total_rate",
+    "amenities", "latitude", "longitude", "image",
+)
+FLIGHT_FIELDS = ("price", "total_duration", "booking_url")
+SEGMENT_FIELDS = (
+    "airline", "airline_logo", "flight_number", "departure_code", "departure_time",
+    "arrival_code", "arrival_time", "duration", "travel_class",
+)
+
+def number(value):
+    return value if isinstance(value, (int, float)) else MISSING
+
+def descending(value):
+    return -value if isinstance(value, (int, float)) else MISSING
+
+def hotel_columns(hotel):
+    return (number(hotel.get("price")), descending(hotel.get("overall_rating")), descending(hotel.get("stars")))
+
+def flight_columns(flight):
+    return (number(flight.get("price")), number(flight.get("total_duration")), max(0, len(flight.get("flights", [])) - 1))
+
+def pack(item, fields):
+    return tuple(tuple(value) if isinstance(value, list) else value for value in (item.get(field) for field in fields))
+
+def unpack(values, fields):
+    return {field: list(value) if isinstance(value, tuple) else value
+            for field, value in zip(fields, values) if value is not None}
+
+def pack_hotel(hotel):
+    return pack(hotel, HOTEL_FIELDS)
+
+def unpack_hotel(values):
+    return unpack(values, HOTEL_FIELDS)
+
+def pack_flight(flight):
+    return pack(flight, FLIGHT_FIELDS) + (tuple(pack(segment, SEGMENT_FIELDS) for segment in flight.get("flights", [])),)
+
+def unpack_flight(values):
+    return dict(unpack(values[:-1], FLIGHT_FIELDS), flights=[unpack(segment, SEGMENT_FIELDS) for segment in values[-1]])
+
+result_kinds = {
+    "hotels": ("hotels", ("price", "rating", "stars"), hotel_columns, pack_hotel, unpack_hotel),
+    "flights": ("flights", ("price", "duration", "stops"), flight_columns, pack_flight, unpack_flight),
+}
+
+filter_columns = {
+    "max_price": ("price", False),
+    "min_rating": ("rating", True),
+    "min_stars": ("stars", True),
+    "max_duration": ("duration", False),
+    "max_stops": ("stops", False),
+}
+
+def deep_size(value):
+    size = sys.getsizeof(value)
+    if isinstance(value, (tuple, list)):
+        size += sum(deep_size(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(deep_size(key) + deep_size(item) for key, item in value.items())
+    return size
+
+def entry_size(entry):
+    return deep_size(entry["meta"]) + deep_size(entry["items"]) + deep_size(entry["columns"])
+
+result_sets = TTLCache(RESULTS_TTL, RESULTS_MAX_SESSIONS * len(result_kinds), RESULTS_MAX_BYTES, entry_size)
+
+def build_view(entry, result_type, sort_by=None, filters=None):
+    names = result_kinds[result_type][1]
+    filters = {name: value for name, value in (filters or {}).items()
+               if value is not None and filter_columns[name][0] in names}
+    order = range(len(entry["items"]))
+
+    columns = entry["columns"]
+    for name, value in filters.items():
+        column, minimum = filter_columns[name]
+        position = names.index(column)
+        limit = -value if minimum else value
+        order = [i for i in order if columns[i][position] <= limit]
+    if sort_by:
+        position = names.index(sort_by)
+        order = sorted(order, key=lambda i: columns[i][position])
+
+    entry["order"] = order if isinstance(order, range) else tuple(order)
+    entry["cursor"] = 0
+    entry["sort_by"] = sort_by
+    entry["filters"] = filters
+
+def next_page(entry, result_type):
+    items_key, _, _, _, unpack_item = result_kinds[result_type]
+    offset = entry["cursor"]
+    indexes = entry["order"][offset:offset + RESULTS_PAGE_SIZE]
+    items = entry["items"]
+    entry["cursor"] = offset + len(indexes)
+    return dict(entry["meta"], **{
+        items_key: [unpack_item(items[i]) for i in indexes],
+        "page": {
+            "result_type": result_type,
+            "offset": offset,
+            "count": len(indexes),
+            "total": len(entry["order"]),
+            "available": len(items),
+            "has_more": entry["cursor"] < len(entry["order"]),
+            "sort_by": entry["sort_by"],
+            "filters": entry["filters"],
+        }
+    })
+
+def retain_results(thread_id, result_type, data):
+    items_key, _, columns_for, pack_item, _ = result_kinds[result_type]
+    items = (data.get(items_key) or [])[:RESULTS_MAX_ITEMS]
+
+    entry = {
+        "meta": {key: value for key, value in data.items() if key not in (items_key, "page")},
+        "items": tuple(pack_item(item) for item in items),
+        "columns": tuple(columns_for(item) for item in items),
+    }
+    build_view(entry, result_type)
+    result_sets.set((thread_id, result_type), entry)
+    return next_page(entry, result_type)
+
+def browse_results(thread_id, result_type, sort_by=None, filters=None):
+    if result_type not in result_kinds:
+        return {"error": f"Bilinmeyen sonuç türü: {result_type}"}
+    entry = result_sets.get((thread_id, result_type))
+    if entry is None:
+        return {"error": "Bu oturumda sayfalanacak sonuç yok veya süresi doldu, lütfen aramayı tekrarlayın"}
+
+    if sort_by and sort_by not in result_kinds[result_type][1]:
+        return {"error": f"'{sort_by}' ile sıralama desteklenmiyor"}
+    filters = filters or {}
+    if not isinstance(filters, dict):
+        return {"error": "Filtreler bir nesne olmalı"}
+    unknown = [name for name in filters if name not in filter_columns]
+    if unknown:
+        return {"error": f"Bilinmeyen filtre: {', '.join(unknown)}"}
+    if any(value is not None and not isinstance(value, (int, float)) for value in filters.values()):
+        return {"error": "Filtre değerleri sayı olmalı"}
+
+    if sort_by or any(value is not None for value in filters.values()):
+        build_view(entry, result_type, sort_by, filters)
+    elif entry["cursor"] >= len(entry["order"]):
+        return {"error": "Gösterilecek başka sonuç yok"}
+    return next_page(entry, result_type)
+
+def results_stats():
+    return result_sets.stats()
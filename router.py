@@ -0,0 +1,98 @@
+import os
+import re
+from airports import clean_query, match_cities
+
+FAST_PATH_ENABLED = os.getenv("FAST_PATH_ENABLED", "true").lower() in ("1", "true", "yes")
+FAST_PATH_MAX_WORDS = int(os.getenv("FAST_PATH_MAX_WORDS", "8"))
+
+WEATHER_PATTERN = re.compile(r"\bhava(?:si|lar|lari)?\b|\bsicaklik\w*|\bderece\b")
+HOTEL_PATTERN = re.compile(r"\botel\w*|\bkonaklama\w*|\bpansiyon\w*")
+DAYS_PATTERN = re.compile(r"\b([1-5])\s*gun\w*")
+TOMORROW_PATTERN = re.compile(r"\byarin\w*")
+STAR_PATTERN = re.compile(r"\b([2-5])\s*yildiz\w*")
+PUNCTUATION_PATTERN = re.compile(r"[^\w\s'’]")
+ALLOWED_WORDS = frozenset((
+    "durumu", "durum", "nasil", "nasildir", "nedir", "ne", "olacak", "bugun", "bugunku", "simdi", "su", "an",
+    "otelleri", "icin", "bana", "lutfen", "ara", "bul", "goster", "oner", "onerir", "onerin",
+    "mi", "mu", "misin", "musun", "miyim", "muyum", "misiniz", "musunuz",
+))
+
+def is_allowed_word(word):
+    return (
+        word in ALLOWED_WORDS
+        or WEATHER_PATTERN.fullmatch(word) is not None
+        or HOTEL_PATTERN.fullmatch(word) is not None
+        or TOMORROW_PATTERN.fullmatch(word) is not None
+    )
+
+def route_message(text):
+    if not FAST_PATH_ENABLED or not isinstance(text, str):
+        return None
+
+    words = [clean_query(word) for word in PUNCTUATION_PATTERN.sub(" ", text).split()]
+    if not words or len(words) > FAST_PATH_MAX_WORDS:
+        return None
+
+    normalized = " ".join(words)
+    weather = WEATHER_PATTERN.search(normalized)
+    hotel = HOTEL_PATTERN.search(normalized)
+    if bool(weather) == bool(hotel):
+        return None
+
+    matches = match_cities(words)
+    cities = set().union(*(matched for _, _, matched in matches))
+    if len(cities) != 1:
+        return None
+    city = cities.pop()
+
+    city_words = {index for start, size, _ in matches for index in range(start, start + size)}
+    remainder = " ".join(word for index, word in enumerate(words) if index not in city_words)
+    days_match = DAYS_PATTERN.search(remainder) if weather else None
+    star_match = STAR_PATTERN.search(remainder) if hotel else None
+    remainder = (DAYS_PATTERN if weather else STAR_PATTERN).sub(" ", remainder)
+    if not all(is_allowed_word(word) for word in remainder.split()):
+        return None
+
+    if weather:
+        days = int(days_match.group(1)) if days_match else 2 if TOMORROW_PATTERN.search(normalized) else 1
+        return {"name": "get_weather", "args": {"city": city, "days": days}}
+
+    args = {"location": city}
+    if star_match:
+        args["star_rating"] = int(star_match.group(1))
+    return {"name": "search_hotels", "args": args}
+
+def render_forecast_day(forecast):
+    line = f"- {forecast.get('day_name')}: {forecast.get('temperature')}°C"
+    if forecast.get("temp_min") is not None and forecast.get("temp_max") is not None:
+        line += f" ({forecast['temp_min']}–{forecast['temp_max']}°C)"
+    line += f", {forecast.get('description')}"
+    if forecast.get("precipitation_probability"):
+        line += f", yağış olasılığı %{forecast['precipitation_probability']}"
+    return line
+
+def render_weather(data):
+    days = "\n".join(render_forecast_day(f) for f in data.get("forecasts", []))
+    return f"🌤️ {data.get('city')} için hava durumu:\n{days}\n\nDetaylar sağ panelde."
+
+def render_hotels(data):
+    hotels = data.get("hotels", [])
+    if not hotels:
+        return f"🏨 {data.get('location')} için uygun otel bulamadım. Farklı bir bölge veya yıldız sayısı denemek ister misiniz?"
+
+    symbol = data.get("currency_symbol", "")
+    lines = []
+    for hotel in hotels[:3]:
+        price = hotel.get("rate_per_night") or hotel.get("total_rate")
+        price_text = f", {symbol}{price}" if price else ""
+        lines.append(f"- {hotel.get('name')} ({hotel.get('overall_rating')}⭐{price_text})")
+    total = (data.get("page") or {}).get("total", len(hotels))
+    return f"🏨 {data.get('location')} için {total} otel buldum. Öne çıkanlar:\n" + "\n".join(lines) + "\n\nTüm sonuçlar sağ panelde."
+
+renderers = {
+    "get_weather": render_weather,
+    "search_hotels": render_hotels,
+}
+
+def render_reply(tool_name, data):
+    return renderers[tool_name](data)
@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import OrderedDict
+from langgraph.checkpoint.memory import MemorySaver
+import metrics
+
+class BoundedMemorySaver(MemorySaver):
+    def __init__(self, ttl=3600, max_bytes=256 * 1024 * 1024):
+        super().__init__()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.RLock()
+        self.last_access = OrderedDict()
+        self.thread_bytes = {}
+        self.thread_blob_keys = {}
+        self.thread_write_keys = {}
+        self.total_bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def touch(self, thread_id):
+        self.last_access[thread_id] = time.monotonic()
+        self.last_access.move_to_end(thread_id)
+
+    def get_tuple(self, config):
+        thread_id = config["configurable"]["thread_id"]
+        with self.lock:
+            if thread_id in self.last_access:
+                self.touch(thread_id)
+            return super().get_tuple(config)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        with self.lock, metrics.timer(metrics.checkpoint_seconds, store="memory"):
+            next_config = super().put(config, checkpoint, metadata, new_versions)
+            blob_keys = self.thread_blob_keys.setdefault(thread_id, set())
+            for channel, version in new_versions.items():
+                blob_keys.add((thread_id, checkpoint_ns, channel, version))
+            self.compact_thread(thread_id, checkpoint_ns, checkpoint)
+            self.touch(thread_id)
+            self.sweep(keep=thread_id)
+            return next_config
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        with self.lock:
+            super().put_writes(config, writes, task_id, task_path)
+            self.thread_write_keys.setdefault(thread_id, set()).add((thread_id, checkpoint_ns, checkpoint_id))
+            self.recount(thread_id)
+
+    def compact_thread(self, thread_id, checkpoint_ns, latest):
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        for checkpoint_id in [c for c in checkpoints if c != latest["id"]]:
+            del checkpoints[checkpoint_id]
+            write_key = (thread_id, checkpoint_ns, checkpoint_id)
+            self.writes.pop(write_key, None)
+            self.thread_write_keys.get(thread_id, set()).discard(write_key)
+
+        live_versions = latest["channel_versions"]
+        blob_keys = self.thread_blob_keys.get(thread_id, set())
+        for key in [k for k in blob_keys if k[1] == checkpoint_ns and live_versions.get(k[2]) != k[3]]:
+            self.blobs.pop(key, None)
+            blob_keys.discard(key)
+
+        self.recount(thread_id)
+
+    def recount(self, thread_id):
+        size = 0
+        for checkpoints in self.storage.get(thread_id, {}).values():
+            for checkpoint, metadata, _ in checkpoints.values():
+                size += len(checkpoint[1]) + len(metadata[1])
+        for key in self.thread_blob_keys.get(thread_id, ()):
+            blob = self.blobs.get(key)
+            if blob is not None:
+                size += len(blob[1])
+        for key in self.thread_write_keys.get(thread_id, ()):
+            for _, _, value, _ in self.writes.get(key, {}).values():
+                size += len(value[1])
+
+        self.total_bytes += size - self.thread_bytes.get(thread_id, 0)
+        self.thread_bytes[thread_id] = size
+
+    def delete_thread(self, thread_id):
+        with self.lock:
+            self.storage.pop(thread_id, None)
+            for key in self.thread_write_keys.pop(thread_id, ()):
+                self.writes.pop(key, None)
+            for key in self.thread_blob_keys.pop(thread_id, ()):
+                self.blobs.pop(key, None)
+            self.total_bytes -= self.thread_bytes.pop(thread_id, 0)
+            self.last_access.pop(thread_id, None)
+
+    def sweep(self, keep=None):
+        with self.lock:
+            expire_before = time.monotonic() - self.ttl
+            for thread_id, accessed_at in list(self.last_access.items()):
+                if accessed_at >= expire_before:
+                    break
+                if thread_id != keep:
+                    self.delete_thread(thread_id)
+                    self.expirations += 1
+
+            for thread_id in list(self.last_access):
+                if self.total_bytes <= self.max_bytes:
+                    break
+                if thread_id != keep:
+                    self.delete_thread(thread_id)
+                    self.evictions += 1
+
+    async def acompact(self):
+        self.sweep()
+
+    async def astats(self):
+        with self.lock:
+            return {
+                "backend": "memory",
+                "threads": len(self.last_access),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -0,0 +1,118 @@
+import os
+import time
+import aiosqlite
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+import metrics
+
+class CompactingSqliteSaver(AsyncSqliteSaver):
+    def __init__(self, conn, ttl=86400, vacuum_pages=256):
+        super().__init__(conn)
+        self.ttl = ttl
+        self.vacuum_pages = vacuum_pages
+        self.compacted_at = 0.0
+        self.expirations = 0
+
+    async def setup(self):
+        if self.is_setup:
+            return
+        await super().setup()
+        async with self.lock:
+            await self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS thread_activity (thread_id TEXT PRIMARY KEY, last_seen REAL)"
+            )
+            await self.conn.commit()
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        with metrics.timer(metrics.checkpoint_seconds, store="sqlite"):
+            next_config = await super().aput(config, checkpoint, metadata, new_versions)
+            async with self.lock:
+                await self.conn.execute(
+                    "INSERT OR REPLACE INTO thread_activity (thread_id, last_seen) VALUES (?, ?)",
+                    (str(config["configurable"]["thread_id"]), time.time())
+                )
+                await self.conn.commit()
+        return next_config
+
+    async def adelete_thread(self, thread_id):
+        await super().adelete_thread(thread_id)
+        async with self.lock:
+            await self.conn.execute("DELETE FROM thread_activity WHERE thread_id = ?", (str(thread_id),))
+            await self.conn.commit()
+
+    async def acompact(self):
+        await self.setup()
+        started = time.time()
+        async with self.lock:
+            cursor = await self.conn.execute(
+                "SELECT thread_id FROM thread_activity WHERE last_seen < ?", (started - self.ttl,)
+            )
+            expired = [row[0] for row in await cursor.fetchall()]
+            for thread_id in expired:
+                await self.conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+                await self.conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+                await self.conn.execute("DELETE FROM thread_activity WHERE thread_id = ?", (thread_id,))
+            self.expirations += len(expired)
+
+            cursor = await self.conn.execute(
+                "SELECT thread_id FROM thread_activity WHERE last_seen >= ?", (self.compacted_at,)
+            )
+            active = [row[0] for row in await cursor.fetchall()]
+            for thread_id in active:
+                await self.conn.execute(
+                    "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_id < ("
+                    "SELECT MAX(latest.checkpoint_id) FROM checkpoints AS latest "
+                    "WHERE latest.thread_id = checkpoints.thread_id AND latest.checkpoint_ns = checkpoints.checkpoint_ns)",
+                    (thread_id,)
+                )
+                await self.conn.execute(
+                    "DELETE FROM writes WHERE thread_id = ? AND NOT EXISTS ("
+                    "SELECT 1 FROM checkpoints AS c WHERE c.thread_id = writes.thread_id "
+                    "AND c.checkpoint_ns = writes.checkpoint_ns AND c.checkpoint_id = writes.checkpoint_id)",
+                    (thread_id,)
+                )
+            await self.conn.commit()
+        self.compacted_at = started
+
+        for _ in range(await self.afree_pages() // self.vacuum_pages):
+            async with self.lock:
+                await self.conn.executescript(f"PRAGMA incremental_vacuum({self.vacuum_pages});")
+
+    async def afree_pages(self):
+        async with self.lock:
+            cursor = await self.conn.execute("PRAGMA freelist_count")
+            return (await cursor.fetchone())[0]
+
+    async def astats(self):
+        await self.setup()
+        async with self.lock:
+            cursor = await self.conn.execute("SELECT COUNT(DISTINCT thread_id) FROM checkpoints")
+            threads = (await cursor.fetchone())[0]
+            cursor = await self.conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(checkpoint) + LENGTH(metadata)), 0) FROM checkpoints"
+            )
+            checkpoint_bytes = (await cursor.fetchone())[0]
+            cursor = await self.conn.execute("SELECT COALESCE(SUM(LENGTH(value)), 0) FROM writes")
+            write_bytes = (await cursor.fetchone())[0]
+
+        return {
+            "backend": "sqlite",
+            "threads": threads,
+            "bytes": checkpoint_bytes + write_bytes,
+            "ttl": self.ttl,
+            "expirations": self.expirations,
+            "free_pages": await self.afree_pages(),
+        }
+
+async def open_sqlite_saver(path, ttl):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = await aiosqlite.connect(path, timeout=30)
+    await conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    cursor = await conn.execute("PRAGMA auto_vacuum")
+    if (await cursor.fetchone())[0] != 2:
+        await conn.execute("VACUUM")
+    await conn.execute("PRAGMA journal_mode=WAL")
+    saver = CompactingSqliteSaver(conn, ttl)
+    await saver.setup()
+    return saver
@@ -0,0 +1,116 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+FRONTEND_DIR = os.getenv("FRONTEND_DIR", "frontend")
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", str(7 * 24 * 3600)))
+COMPRESS_MIN_BYTES = 512
+
+assets = None
+
+def compress_variants(body):
+    variants = {}
+    if len(body) < COMPRESS_MIN_BYTES:
+        return variants
+    variants["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=11)
+    return {encoding: data for encoding, data in variants.items() if len(data) < len(body)}
+
+def build_asset(body, media_type, cache_control):
+    digest = hashlib.sha256(body).hexdigest()[:20]
+    variants = compress_variants(body)
+    return {
+        "body": body,
+        "variants": variants,
+        "etag": f'"{digest}"',
+        "etags": {None: f'"{digest}"', **{encoding: f'"{digest}-{encoding}"' for encoding in variants}},
+        "media_type": media_type,
+        "cache_control": cache_control,
+    }
+
+def load_assets(directory):
+    loaded = {}
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if name == "index.html" or not os.path.isfile(path):
+            continue
+        with open(path, "rb") as f:
+            body = f.read()
+        media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        if media_type.startswith("text/"):
+            media_type += "; charset=utf-8"
+        loaded[name] = build_asset(body, media_type, f"public, max-age={STATIC_MAX_AGE}, immutable")
+
+    with open(os.path.join(directory, "index.html"), encoding="utf-8") as f:
+        html = f.read()
+    for name, asset in loaded.items():
+        version = asset["etag"].strip('"')[:12]
+        html = html.replace(f'"/static/{name}"', f'"/static/{name}?v={version}"')
+    loaded["index.html"] = build_asset(html.encode("utf-8"), "text/html; charset=utf-8", "no-cache")
+    return loaded
+
+def get_assets():
+    global assets
+    if assets is None:
+        assets = load_assets(FRONTEND_DIR)
+    return assets
+
+def accepted_encodings(header):
+    accepted = set()
+    for part in (header or "").split(","):
+        token, *params = [piece.strip() for piece in part.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if token and quality > 0:
+            accepted.add(token.lower())
+    return accepted
+
+def choose_encoding(asset, header):
+    accepted = accepted_encodings(header)
+    for encoding in ("br", "gzip"):
+        if (encoding in accepted or "*" in accepted) and encoding in asset["variants"]:
+            return encoding
+    return None
+
+def etag_matches(asset, header):
+    tags = {tag.strip().removeprefix("W/") for tag in (header or "").split(",")}
+    return "*" in tags or any(etag in tags for etag in asset["etags"].values())
+
+def asset_response(name, request):
+    asset = get_assets().get(name)
+    if asset is None:
+        return Response(status_code=404)
+
+    encoding = choose_encoding(asset, request.headers.get("accept-encoding"))
+    headers = {
+        "ETag": asset["etags"][encoding],
+        "Cache-Control": asset["cache_control"],
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(asset, request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+
+    if encoding is None:
+        return Response(asset["body"], media_type=asset["media_type"], headers=headers)
+    headers["Content-Encoding"] = encoding
+    return Response(asset["variants"][encoding], media_type=asset["media_type"], headers=headers)
+
+def asset_stats():
+    return {
+        name: {"bytes": len(asset["body"]), **{encoding: len(data) for encoding, data in asset["variants"].items()}}
+        for name, asset in get_assets().items()
+    }
@@ -1,194 +1,403 @@
+import asyncio
 import os
-import requests
+import re
+import httpx
 from dotenv import load_dotenv
-from datetime import datetime
+from datetime import datetime, date, timedelta, timezone
+from functools import lru_cache
+import http_client
+import metrics
+from http_client import CircuitOpenError
+from admission import AdmissionRejected
+from airports import resolve_airport, search_airports
+from cache import TTLCache, SWRCache, MemoryBackend, SQLiteBackend, normalize_key
 load_dotenv()
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 WEATHER_API_KEY = os.getenv("WEATHER_API_KEY")
 SERP_API_KEY = os.getenv("SERP_API_KEY")
 
+WEATHER_API_URL = os.getenv("WEATHER_API_URL", "http://api.openweathermap.org/data/2.5")
+SERP_API_URL = os.getenv("SERP_API_URL", "https://serpapi.com/search.json")
+
+WEATHER_CACHE_TTL = int(os.getenv("WEATHER_CACHE_TTL", "600"))
+FORECAST_CACHE_TTL = int(os.getenv("FORECAST_CACHE_TTL", "3600"))
+WEATHER_CACHE_SIZE = int(os.getenv("WEATHER_CACHE_SIZE", "512"))
+
+current_weather_cache = TTLCache(WEATHER_CACHE_TTL, WEATHER_CACHE_SIZE)
+forecast_cache = TTLCache(FORECAST_CACHE_TTL, WEATHER_CACHE_SIZE)
+weather_inflight = {}
+weather_coalesced = {"weather": 0, "forecast": 0}
+
+SERP_CACHE_TTL = int(os.getenv("SERP_CACHE_TTL", "1800"))
+SERP_CACHE_STALE_TTL = int(os.getenv("SERP_CACHE_STALE_TTL", "7200"))
+SERP_CACHE_SIZE = int(os.getenv("SERP_CACHE_SIZE", "1000"))
+SERP_CACHE_BACKEND = os.getenv("SERP_CACHE_BACKEND", "memory")
+SERP_CACHE_PATH = os.getenv("SERP_CACHE_PATH", ".cache/serpapi.sqlite3")
+
+def create_serp_cache_backend():
+    if SERP_CACHE_BACKEND == "sqlite":
+        return SQLiteBackend(SERP_CACHE_PATH, SERP_CACHE_SIZE)
+    return MemoryBackend(SERP_CACHE_SIZE)
+
+serp_cache = SWRCache(create_serp_cache_backend(), SERP_CACHE_TTL, SERP_CACHE_STALE_TTL)
+
+def serp_cache_key(params):
+    parts = []
+    for name in sorted(params):
+        if name == "api_key":
+            continue
+        value = params[name]
+        if name == "q":
+            value = normalize_key(value)
+        parts.append(f"{name}={value}")
+    return "&".join(parts)
+
+WEATHER_TYPE_PATTERNS = (
+    ("rainy", re.compile(r"rain|drizzle|shower|yağmur")),
+    ("snowy", re.compile(r"snow|kar")),
+    ("cloudy", re.compile(r"cloud|bulut|kapalı")),
+    ("stormy", re.compile(r"thunder|storm|fırtına")),
+    ("sunny", re.compile(r"clear|açık")),
+    ("foggy", re.compile(r"mist|fog|sis")),
+)
+
+CONDITION_GROUPS = {2: "stormy", 3: "rainy", 5: "rainy", 6: "snowy", 7: "foggy"}
+
+@lru_cache(maxsize=256)
 def get_weather_type(description):
     desc_lower = description.lower()
-    if "rain" in desc_lower or "drizzle" in desc_lower or "shower" in desc_lower or "yağmur" in desc_lower:
-        return "rainy"
-    elif "snow" in desc_lower or "kar" in desc_lower:
-        return "snowy"
-    elif "cloud" in desc_lower or "bulut" in desc_lower or "kapalı" in desc_lower:
-        return "cloudy"
-    elif "thunder" in desc_lower or "storm" in desc_lower or "fırtına" in desc_lower:
-        return "stormy"
-    elif "clear" in desc_lower or "açık" in desc_lower:
-        return "sunny"
-    elif "mist" in desc_lower or "fog" in desc_lower or "sis" in desc_lower:
-        return "foggy"
-    else:
-        return "default"
+    for weather_type, pattern in WEATHER_TYPE_PATTERNS:
+        if pattern.search(desc_lower):
+            return weather_type
+    return "default"
+
+def classify_condition(condition):
+    condition_id = condition.get("id")
+    if isinstance(condition_id, int):
+        if condition_id == 800:
+            return "sunny"
+        if 801 <= condition_id <= 804:
+            return "cloudy"
+        if condition_id // 100 in CONDITION_GROUPS:
+            return CONDITION_GROUPS[condition_id // 100]
+    return get_weather_type(condition.get("description", ""))
 
 def get_turkish_day_name(weekday):
     days = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
     return days[weekday]
 
+def build_weather_request(city, days):
+    endpoint = weather_endpoint(days)
+    params = {
+        "q": city,
+        "appid": WEATHER_API_KEY,
+        "units": "metric",
+        "lang": "tr"
+    }
+    return f"{WEATHER_API_URL}/{endpoint}", params
+
+def local_time(timestamp, offset):
+    return datetime.fromtimestamp(timestamp, timezone(timedelta(seconds=offset)))
+
+def parse_current_weather(data):
+    condition = data["weather"][0]
+    now = local_time(data.get("dt", datetime.now().timestamp()), data.get("timezone", 0))
+
+    return {
+        "city": data["name"],
+        "type": "current",
+        "forecasts": [{
+            "date": now.strftime("%d %B %Y"),
+            "day_name": get_turkish_day_name(now.weekday()),
+            "temperature": round(data["main"]["temp"]),
+            "temp_min": round(data["main"].get("temp_min", data["main"]["temp"])),
+            "temp_max": round(data["main"].get("temp_max", data["main"]["temp"])),
+            "description": condition["description"].capitalize(),
+            "weather_type": classify_condition(condition),
+            "feels_like": round(data["main"]["feels_like"]),
+            "humidity": data["main"]["humidity"],
+            "icon": condition["icon"]
+        }]
+    }
+
+def aggregate_forecast(data):
+    offset = data["city"].get("timezone", 0)
+    days = {}
+    for item in data["list"]:
+        local_seconds = item["dt"] + offset
+        day_index, seconds_of_day = divmod(local_seconds, 86400)
+        main = item["main"]
+        temp = main["temp"]
+        day = days.get(day_index)
+        if day is None:
+            day = days[day_index] = [temp, temp, 0.0, 0, 0.0, {}, {}]
+        day[0] = min(day[0], main.get("temp_min", temp))
+        day[1] = max(day[1], main.get("temp_max", temp))
+        day[2] += temp
+        day[3] += 1
+        day[4] = max(day[4], item.get("pop", 0))
+
+        hour = seconds_of_day // 3600
+        pod = item["sys"]["pod"] if "sys" in item else "d" if 6 <= hour < 18 else "n"
+        if pod == "d":
+            condition = item["weather"][0]
+            weather_type = classify_condition(condition)
+            type_counts, nearest_noon = day[5], day[6]
+            type_counts[weather_type] = type_counts.get(weather_type, 0) + 1
+            nearest = nearest_noon.get(weather_type)
+            if nearest is None or abs(hour - 12) < nearest[0]:
+                nearest_noon[weather_type] = (abs(hour - 12), main, condition)
+
+    forecasts = []
+    for day_index in sorted(days):
+        low, high, total, count, pop, type_counts, nearest_noon = days[day_index]
+        if not type_counts:
+            continue
+        dominant = max(type_counts, key=type_counts.get)
+        _, main, condition = nearest_noon[dominant]
+        local_date = local_time(day_index * 86400, 0)
+        forecasts.append((
+            local_date.strftime("%d %B"),
+            get_turkish_day_name(local_date.weekday()),
+            round(main["temp"]),
+            round(low),
+            round(high),
+            round(total / count, 1),
+            round(pop * 100),
+            dominant,
+            condition["description"].capitalize(),
+            round(main["feels_like"]),
+            main["humidity"],
+            condition["icon"],
+        ))
+
+    return {"city": data["city"]["name"], "days": tuple(forecasts)}
+
+FORECAST_FIELDS = (
+    "date", "day_name", "temperature", "temp_min", "temp_max", "temp_mean",
+    "precipitation_probability", "weather_type", "description", "feels_like", "humidity", "icon",
+)
+
+def forecast_view(aggregate, days):
+    return {
+        "city": aggregate["city"],
+        "type": "forecast",
+        "days": days,
+        "forecasts": [dict(zip(FORECAST_FIELDS, day)) for day in aggregate["days"][:days]]
+    }
+
+def parse_weather(data, days):
+    if days == 1:
+        return parse_current_weather(data)
+    return forecast_view(aggregate_forecast(data), days)
+
+def compact_weather(data, days):
+    if days == 1:
+        return parse_current_weather(data)
+    return aggregate_forecast(data)
+
+def weather_view(cached, days):
+    if days == 1:
+        return cached
+    return forecast_view(cached, days)
+
+def weather_cache_for(days):
+    return current_weather_cache if days == 1 else forecast_cache
+
+def weather_endpoint(days):
+    return "weather" if days == 1 else "forecast"
+
+def cache_stats():
+    return {
+        "weather": {**current_weather_cache.stats(), "coalesced": weather_coalesced["weather"]},
+        "forecast": {**forecast_cache.stats(), "coalesced": weather_coalesced["forecast"]},
+        "serpapi": serp_cache.stats(),
+        "circuit_breakers": http_client.breaker_stats()
+    }
+
 def get_weather(city, days=1):
+    import requests
     days = max(1, min(5, days))
-    
-    if days == 1:
-        api_url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={WEATHER_API_KEY}&units=metric&lang=tr"
-        
-        try:
-            response = requests.get(api_url)
-            response.raise_for_status()
-            data = response.json()
-            
-            description = data["weather"][0]["description"]
-            
-            weather_info = {
-                "city": data["name"],
-                "type": "current",
-                "forecasts": [{
-                    "date": datetime.now().strftime("%d %B %Y"),
-                    "day_name": get_turkish_day_name(datetime.now().weekday()),
-                    "temperature": round(data["main"]["temp"]),
-                    "description": description.capitalize(),
-                    "weather_type": get_weather_type(description),
-                    "feels_like": round(data["main"]["feels_like"]),
-                    "humidity": data["main"]["humidity"],
-                    "icon": data["weather"][0]["icon"]
-                }]
-            }
-            return weather_info
-        except requests.exceptions.RequestException as e:
-            return {"error": f"Hava durumu bilgisi alınamadı: {str(e)}"}
-        except KeyError:
-            return {"error": "Hava durumu verisi işlenemedi"}
+    cache = weather_cache_for(days)
+    cache_key = normalize_key(city)
+
+    try:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return weather_view(cached, days)
+
+        api_url, params = build_weather_request(city, days)
+        response = http_client.get("openweathermap", api_url, params=params)
+        response.raise_for_status()
+        with metrics.timer(metrics.parse_seconds, tool="get_weather"):
+            compact = compact_weather(response.json(), days)
+        cache.set(cache_key, compact)
+        return weather_view(compact, days)
+    except (requests.exceptions.RequestException, CircuitOpenError) as e:
+        return {"error": f"Hava durumu bilgisi alınamadı: {str(e)}"}
+    except KeyError as e:
+        return {"error": f"Hava durumu verisi işlenemedi: {str(e)}"}
+
+async def afetch_weather(city, days, cache, cache_key):
+    api_url, params = build_weather_request(city, days)
+    response = await http_client.aget("openweathermap", api_url, params=params)
+    response.raise_for_status()
+    with metrics.timer(metrics.parse_seconds, tool="get_weather"):
+        compact = compact_weather(response.json(), days)
+    cache.set(cache_key, compact)
+    return compact
+
+async def aget_weather(city, days=1):
+    days = max(1, min(5, days))
+    cache = weather_cache_for(days)
+    cache_key = normalize_key(city)
+
+    try:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return weather_view(cached, days)
+
+        endpoint = weather_endpoint(days)
+        inflight_key = (endpoint, cache_key)
+        task = weather_inflight.get(inflight_key)
+        if task is not None:
+            weather_coalesced[endpoint] += 1
+        else:
+            task = asyncio.get_running_loop().create_task(afetch_weather(city, days, cache, cache_key))
+            weather_inflight[inflight_key] = task
+            task.add_done_callback(lambda _: weather_inflight.pop(inflight_key, None))
+        compact = await asyncio.shield(task)
+        return weather_view(compact, days)
+    except (httpx.HTTPError, CircuitOpenError) as e:
+        return {"error": f"Hava durumu bilgisi alınamadı: {str(e)}"}
+    except KeyError as e:
+        return {"error": f"Hava durumu verisi işlenemedi: {str(e)}"}
+
+def hotel_dates(check_in_date=None, check_out_date=None):
+    if check_in_date:
+        check_in = date.fromisoformat(check_in_date)
     else:
-        api_url = f"http://api.openweathermap.org/data/2.5/forecast?q={city}&appid={WEATHER_API_KEY}&units=metric&lang=tr"
-        
-        try:
-            response = requests.get(api_url)
-            response.raise_for_status()
-            data = response.json()
-            
-            daily_forecasts = {}
-            for item in data["list"]:
-                dt = datetime.fromtimestamp(item["dt"])
-                date_str = dt.strftime("%Y-%m-%d")
-                
-                if date_str not in daily_forecasts:
-                    hour = dt.hour
-                    if 11 <= hour <= 14:
-                        description = item["weather"][0]["description"]
-                        daily_forecasts[date_str] = {
-                            "date": dt.strftime("%d %B"),
-                            "day_name": get_turkish_day_name(dt.weekday()),
-                            "temperature": round(item["main"]["temp"]),
-                            "description": description.capitalize(),
-                            "weather_type": get_weather_type(description),
-                            "feels_like": round(item["main"]["feels_like"]),
-                            "humidity": item["main"]["humidity"],
-                            "icon": item["weather"][0]["icon"]
-                        }
-            
-            forecasts = list(daily_forecasts.values())[:days]
-            
-            weather_info = {
-                "city": data["city"]["name"],
-                "type": "forecast",
-                "days": days,
-                "forecasts": forecasts
-            }
-            return weather_info
-        except requests.exceptions.RequestException as e:
-            return {"error": f"Hava durumu bilgisi alınamadı: {str(e)}"}
-        except KeyError as e:
-            return {"error": f"Hava durumu verisi işlenemedi: {str(e)}"}
-
-def search_hotels(location, budget=None, star_rating=None):
-    import datetime
-    api_url = "https://serpapi.com/search.json"
-    
-    today = datetime.date.today()
-    check_in = today + datetime.timedelta(days=30)
-    check_out = check_in + datetime.timedelta(days=1)
-    
+        check_in = date.today() + timedelta(days=30)
+    if check_out_date:
+        check_out = date.fromisoformat(check_out_date)
+    else:
+        check_out = check_in + timedelta(days=1)
+    return check_in.strftime("%Y-%m-%d"), check_out.strftime("%Y-%m-%d")
+
+def build_hotel_params(location, budget=None, star_rating=None, check_in_date=None, check_out_date=None):
+    check_in, check_out = hotel_dates(check_in_date, check_out_date)
+
     params = {
         "engine": "google_hotels",
         "q": location,
-        "check_in_date": check_in.strftime("%Y-%m-%d"),
-        "check_out_date": check_out.strftime("%Y-%m-%d"),
+        "check_in_date": check_in,
+        "check_out_date": check_out,
         "adults": "2",
         "currency": "TRY",
         "gl": "tr",
         "hl": "tr",
         "api_key": SERP_API_KEY
     }
-    
+
     if budget:
         params["max_price"] = budget
-    
+
     if star_rating and star_rating in [2, 3, 4, 5]:
         params["hotel_class"] = star_rating
-    
+
+    return params
+
+def parse_hotels(data, location, budget=None, star_rating=None):
+    properties = data.get("properties", [])
+    hotels = []
+
+    for prop in properties:
+        hotel_info = {
+            "name": prop.get("name"),
+            "type": prop.get("type"),
+            "overall_rating": prop.get("overall_rating"),
+            "reviews": prop.get("reviews"),
+            "hotel_class": prop.get("hotel_class"),
+            "stars": prop.get("extracted_hotel_class"),
+            "description": prop.get("description"),
+        }
+
+        images = prop.get("images", [])
+        if not images:
+            if prop.get("thumbnail"):
+                hotel_info["image"] = prop.get("thumbnail")
+        elif len(images) > 0:
+            first_image = images[0]
+            hotel_info["image"] = first_image.get("thumbnail") or first_image.get("original_image") or first_image.get("link")
+
+        if "gps_coordinates" in prop:
+            gps = prop["gps_coordinates"]
+            hotel_info["latitude"] = gps.get("latitude")
+            hotel_info["longitude"] = gps.get("longitude")
+
+        if "rate_per_night" in prop:
+            hotel_info["rate_per_night"] = prop["rate_per_night"].get("lowest")
+            hotel_info["price"] = prop["rate_per_night"].get("extracted_lowest")
+        elif "total_rate" in prop:
+            hotel_info["total_rate"] = prop["total_rate"].get("lowest")
+            hotel_info["price"] = prop["total_rate"].get("extracted_lowest")
+
+        if "amenities" in prop:
+            hotel_info["amenities"] = prop["amenities"][:5]
+
+        hotels.append(hotel_info)
+
+    currency_code = data.get("currency", "TRY")
+    currency_symbol = data.get("currency_symbol", "₺")
+
+    return {
+        "location": location,
+        "budget": budget,
+        "star_rating": star_rating,
+        "currency": currency_code,
+        "currency_symbol": currency_symbol,
+        "hotels": hotels
+    }
+
+def fetch_hotels(params, location, budget=None, star_rating=None):
+    import requests
     try:
-        response = requests.get(api_url, params=params)
+        response = http_client.get("serpapi", SERP_API_URL, params=params)
         response.raise_for_status()
-        data = response.json()
-        
-        properties = data.get("properties", [])
-        hotels = []
-        
-        for prop in properties[:5]:
-            hotel_info = {
-                "name": prop.get("name"),
-                "type": prop.get("type"),
-                "overall_rating": prop.get("overall_rating"),
-                "reviews": prop.get("reviews"),
-                "hotel_class": prop.get("hotel_class"),
-                "description": prop.get("description"),
-            }
-            
-            images = prop.get("images", [])
-            if not images:
-                if prop.get("thumbnail"):
-                    hotel_info["image"] = prop.get("thumbnail")
-            elif len(images) > 0:
-                first_image = images[0]
-                hotel_info["image"] = first_image.get("thumbnail") or first_image.get("original_image") or first_image.get("link")
-            
-            if "gps_coordinates" in prop:
-                gps = prop["gps_coordinates"]
-                hotel_info["latitude"] = gps.get("latitude")
-                hotel_info["longitude"] = gps.get("longitude")
-            
-            if "rate_per_night" in prop:
-                hotel_info["rate_per_night"] = prop["rate_per_night"].get("lowest")
-            elif "total_rate" in prop:
-                hotel_info["total_rate"] = prop["total_rate"].get("lowest")
-            
-            if "amenities" in prop:
-                hotel_info["amenities"] = prop["amenities"][:5]
-            
-            hotels.append(hotel_info)
-        
-        currency_code = data.get("currency", "TRY")
-        currency_symbol = data.get("currency_symbol", "₺")
-        
-        return {
-            "location": location,
-            "budget": budget,
-            "star_rating": star_rating,
-            "currency": currency_code,
-            "currency_symbol": currency_symbol,
-            "hotels": hotels
-        }
-    except requests.exceptions.RequestException as e:
+        with metrics.timer(metrics.parse_seconds, tool="search_hotels"):
+            return parse_hotels(response.json(), location, budget, star_rating)
+    except (requests.exceptions.RequestException, CircuitOpenError) as e:
         return {"error": f"Otel arama başarısız: {str(e)}"}
     except (KeyError, ValueError) as e:
         return {"error": f"Otel verisi işlenemedi: {str(e)}"}
 
-def search_flights(departure, arrival, outbound_date, return_date=None, adults=1):
-    api_url = "https://serpapi.com/search.json"
-    
+async def afetch_hotels(params, location, budget=None, star_rating=None):
+    try:
+        response = await http_client.aget("serpapi", SERP_API_URL, params=params)
+        response.raise_for_status()
+        with metrics.timer(metrics.parse_seconds, tool="search_hotels"):
+            return parse_hotels(response.json(), location, budget, star_rating)
+    except (httpx.HTTPError, CircuitOpenError, AdmissionRejected) as e:
+        return {"error": f"Otel arama başarısız: {str(e)}"}
+    except (KeyError, ValueError) as e:
+        return {"error": f"Otel verisi işlenemedi: {str(e)}"}
+
+def search_hotels(location, budget=None, star_rating=None, check_in_date=None, check_out_date=None):
+    params = build_hotel_params(location, budget, star_rating, check_in_date, check_out_date)
+    return serp_cache.get_or_fetch(
+        serp_cache_key(params),
+        lambda: fetch_hotels(params, location, budget, star_rating)
+    )
+
+async def asearch_hotels(location, budget=None, star_rating=None, check_in_date=None, check_out_date=None):
+    params = build_hotel_params(location, budget, star_rating, check_in_date, check_out_date)
+    return await serp_cache.aget_or_fetch(
+        serp_cache_key(params),
+        lambda: afetch_hotels(params, location, budget, star_rating)
+    )
+
+def build_flight_params(departure, arrival, outbound_date, return_date=None, adults=1):
     params = {
         "engine": "google_flights",
         "departure_id": departure.upper(),
@@ -200,70 +409,212 @@ def search_flights(departure, arrival, outbound_date, return_date=None, adults=1
         "gl": "tr",
         "api_key": SERP_API_KEY
     }
-    
+
     if return_date:
         params["return_date"] = return_date
         params["type"] = "1"
     else:
         params["type"] = "2"
-    
+
+    return params
+
+def parse_flights(data, departure, arrival, outbound_date, return_date=None, adults=1):
+    best_flights = data.get("best_flights", [])
+    other_flights = data.get("other_flights", [])
+    all_flights = best_flights + other_flights
+
+    flights = []
+    for flight_option in all_flights:
+        segments = flight_option.get("flights", [])
+
+        flight_info = {
+            "price": flight_option.get("price"),
+            "type": flight_option.get("type"),
+            "airline_logo": flight_option.get("airline_logo"),
+            "total_duration": flight_option.get("total_duration"),
+            "carbon_emissions": flight_option.get("carbon_emissions", {}).get("this_flight"),
+            "booking_url": None,
+            "flights": []
+        }
+
+        for segment in segments:
+            segment_info = {
+                "departure_airport": segment.get("departure_airport", {}).get("name"),
+                "departure_code": segment.get("departure_airport", {}).get("id"),
+                "departure_time": segment.get("departure_airport", {}).get("time"),
+                "arrival_airport": segment.get("arrival_airport", {}).get("name"),
+                "arrival_code": segment.get("arrival_airport", {}).get("id"),
+                "arrival_time": segment.get("arrival_airport", {}).get("time"),
+                "duration": segment.get("duration"),
+                "airplane": segment.get("airplane"),
+                "airline": segment.get("airline"),
+                "airline_logo": segment.get("airline_logo"),
+                "flight_number": segment.get("flight_number"),
+                "travel_class": segment.get("travel_class"),
+                "legroom": segment.get("legroom"),
+            }
+            flight_info["flights"].append(segment_info)
+
+        flights.append(flight_info)
+
+    google_flights_url = f"https://www.google.com/travel/flights?q={departure.upper()}%20to%20{arrival.upper()}%20{outbound_date}"
+
+    return {
+        "departure": departure.upper(),
+        "arrival": arrival.upper(),
+        "outbound_date": outbound_date,
+        "return_date": return_date,
+        "adults": adults,
+        "currency": "TRY",
+        "currency_symbol": "₺",
+        "google_flights_url": google_flights_url,
+        "flights": flights
+    }
+
+def fetch_flights(params, departure, arrival, outbound_date, return_date=None, adults=1):
+    import requests
     try:
-        response = requests.get(api_url, params=params)
+        response = http_client.get("serpapi", SERP_API_URL, params=params)
         response.raise_for_status()
-        data = response.json()
-        
-        best_flights = data.get("best_flights", [])
-        other_flights = data.get("other_flights", [])
-        all_flights = best_flights + other_flights
-        
-        flights = []
-        for flight_option in all_flights[:5]:
-            segments = flight_option.get("flights", [])
-            
-            flight_info = {
-                "price": flight_option.get("price"),
-                "type": flight_option.get("type"),
-                "airline_logo": flight_option.get("airline_logo"),
-                "total_duration": flight_option.get("total_duration"),
-                "carbon_emissions": flight_option.get("carbon_emissions", {}).get("this_flight"),
-                "booking_url": None,
-                "flights": []
-            }
-            
-            for segment in segments:
-                segment_info = {
-                    "departure_airport": segment.get("departure_airport", {}).get("name"),
-                    "departure_code": segment.get("departure_airport", {}).get("id"),
-                    "departure_time": segment.get("departure_airport", {}).get("time"),
-                    "arrival_airport": segment.get("arrival_airport", {}).get("name"),
-                    "arrival_code": segment.get("arrival_airport", {}).get("id"),
-                    "arrival_time": segment.get("arrival_airport", {}).get("time"),
-                    "duration": segment.get("duration"),
-                    "airplane": segment.get("airplane"),
-                    "airline": segment.get("airline"),
-                    "airline_logo": segment.get("airline_logo"),
-                    "flight_number": segment.get("flight_number"),
-                    "travel_class": segment.get("travel_class"),
-                    "legroom": segment.get("legroom"),
-                }
-                flight_info["flights"].append(segment_info)
-            
-            flights.append(flight_info)
-        
-        google_flights_url = f"https://www.google.com/travel/flights?q={departure.upper()}%20to%20{arrival.upper()}%20{outbound_date}"
-        
-        return {
-            "departure": departure.upper(),
-            "arrival": arrival.upper(),
-            "outbound_date": outbound_date,
-            "return_date": return_date,
-            "adults": adults,
-            "currency": "TRY",
-            "currency_symbol": "₺",
-            "google_flights_url": google_flights_url,
-            "flights": flights
-        }
-    except requests.exceptions.RequestException as e:
+        with metrics.timer(metrics.parse_seconds, tool="search_flights"):
+            return parse_flights(response.json(), departure, arrival, outbound_date, return_date, adults)
+    except (requests.exceptions.RequestException, CircuitOpenError) as e:
         return {"error": f"Uçuş arama başarısız: {str(e)}"}
     except (KeyError, ValueError) as e:
-        return {"error": f"Uçuş verisi işlenemedi: {str(e)}"}
\ No newline at end of file
+        return {"error": f"Uçuş verisi işlenemedi: {str(e)}"}
+
+async def afetch_flights(params, departure, arrival, outbound_date, return_date=None, adults=1):
+    try:
+        response = await http_client.aget("serpapi", SERP_API_URL, params=params)
+        response.raise_for_status()
+        with metrics.timer(metrics.parse_seconds, tool="search_flights"):
+            return parse_flights(response.json(), departure, arrival, outbound_date, return_date, adults)
+    except (httpx.HTTPError, CircuitOpenError, AdmissionRejected) as e:
+        return {"error": f"Uçuş arama başarısız: {str(e)}"}
+    except (KeyError, ValueError) as e:
+        return {"error": f"Uçuş verisi işlenemedi: {str(e)}"}
+
+def resolve_flight_airports(departure, arrival):
+    departure_code = resolve_airport(departure)
+    arrival_code = resolve_airport(arrival)
+    for value, code in ((departure, departure_code), (arrival, arrival_code)):
+        if code is None:
+            suggestions = search_airports(value, limit=3)
+            if suggestions:
+                names = ", ".join(f"{match['city']} ({match['code']})" for match in suggestions)
+                return None, None, {
+                    "error": f"'{value}' için kesin bir havalimanı bulunamadı. Şunlardan biri mi: {names}? Lütfen find_airport ile doğrulayın",
+                    "suggestions": suggestions
+                }
+            return None, None, {"error": f"'{value}' için havalimanı bulunamadı, lütfen şehir adını veya IATA kodunu kontrol edin"}
+    return departure_code, arrival_code, None
+
+def search_flights(departure, arrival, outbound_date, return_date=None, adults=1):
+    departure, arrival, error = resolve_flight_airports(departure, arrival)
+    if error:
+        return error
+    params = build_flight_params(departure, arrival, outbound_date, return_date, adults)
+    return serp_cache.get_or_fetch(
+        serp_cache_key(params),
+        lambda: fetch_flights(params, departure, arrival, outbound_date, return_date, adults)
+    )
+
+async def asearch_flights(departure, arrival, outbound_date, return_date=None, adults=1):
+    departure, arrival, error = resolve_flight_airports(departure, arrival)
+    if error:
+        return error
+    params = build_flight_params(departure, arrival, outbound_date, return_date, adults)
+    return await serp_cache.aget_or_fetch(
+        serp_cache_key(params),
+        lambda: afetch_flights(params, departure, arrival, outbound_date, return_date, adults)
+    )
+
+def find_airport(query, limit=5):
+    matches = search_airports(query, limit)
+    if not matches:
+        return {"error": f"'{query}' için havalimanı bulunamadı"}
+    return {"query": query, "airports": matches}
+
+def project_weather(data):
+    return {
+        "city": data.get("city"),
+        "forecasts": [{
+            "date": f.get("date"),
+            "day_name": f.get("day_name"),
+            "temperature": f.get("temperature"),
+            "temp_min": f.get("temp_min"),
+            "temp_max": f.get("temp_max"),
+            "precipitation_probability": f.get("precipitation_probability"),
+            "description": f.get("description"),
+            "feels_like": f.get("feels_like"),
+            "humidity": f.get("humidity")
+        } for f in data.get("forecasts", [])]
+    }
+
+def project_hotels(data):
+    hotels = []
+    for hotel in data.get("hotels", []):
+        slim = {
+            "name": hotel.get("name"),
+            "overall_rating": hotel.get("overall_rating"),
+            "reviews": hotel.get("reviews"),
+            "hotel_class": hotel.get("hotel_class"),
+        }
+        if hotel.get("rate_per_night"):
+            slim["rate_per_night"] = hotel["rate_per_night"]
+        elif hotel.get("total_rate"):
+            slim["total_rate"] = hotel["total_rate"]
+        hotels.append(slim)
+
+    return {
+        "location": data.get("location"),
+        "currency": data.get("currency"),
+        "hotels": hotels,
+        "page": data.get("page")
+    }
+
+def project_flights(data):
+    flights = []
+    for flight in data.get("flights", []):
+        segments = flight.get("flights", [])
+        flights.append({
+            "price": flight.get("price"),
+            "total_duration": flight.get("total_duration"),
+            "stops": max(0, len(segments) - 1),
+            "flights": [{
+                "airline": s.get("airline"),
+                "flight_number": s.get("flight_number"),
+                "departure_code": s.get("departure_code"),
+                "departure_time": s.get("departure_time"),
+                "arrival_code": s.get("arrival_code"),
+                "arrival_time": s.get("arrival_time")
+            } for s in segments]
+        })
+
+    return {
+        "departure": data.get("departure"),
+        "arrival": data.get("arrival"),
+        "outbound_date": data.get("outbound_date"),
+        "return_date": data.get("return_date"),
+        "currency": data.get("currency"),
+        "flights": flights,
+        "page": data.get("page")
+    }
+
+def project_page(data):
+    if "hotels" in data:
+        return project_hotels(data)
+    return project_flights(data)
+
+tool_projections = {
+    "get_weather": project_weather,
+    "search_hotels": project_hotels,
+    "search_flights": project_flights,
+    "browse_results": project_page,
+}
+
+def project_tool_result(tool_name, data):
+    projection = tool_projections.get(tool_name)
+    if projection is None:
+        return data
+    return projection(data)